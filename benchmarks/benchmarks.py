@@ -0,0 +1,273 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+from engine.batch import move_batch
+from engine.bitboard import DIRECTIONS, Game_value, is_game_over, legal_mask, move
+
+# Mesures de performance du moteur, des agents et de l'entraînement.
+#
+#   python -m benchmarks.benchmarks --output bench.json
+#   python -m benchmarks.benchmarks --compare bench.json
+#
+# Chaque mesure est un dictionnaire {"name", "params", "metric", "value",
+# "higher_is_better"} ; la comparaison signale les mesures qui se dégradent
+# de plus de --threshold par rapport au fichier de référence.
+
+FILL_LEVELS = (4, 8, 12, 15)  # Nombre de cases occupées des plateaux de test
+THRESHOLD = 0.10  # Dégradation tolérée avant de signaler une régression
+SEED = 2048
+
+
+def boards_with_fill(nb_boards, fill, rng, playable=True):
+    """
+    Tire des plateaux avec fill cases occupées (exposants 1 à 10).
+
+    Args:
+        nb_boards (int): Nombre de plateaux.
+        fill (int): Nombre de cases occupées.
+        rng (random.Random): Générateur aléatoire.
+        playable (bool): True pour écarter les plateaux sans coup possible.
+
+    Returns:
+        list: Les plateaux compactés.
+    """
+    boards = []
+    while len(boards) < nb_boards:
+        board = 0
+        for cell in rng.sample(range(16), fill):
+            board |= rng.randint(1, 10) << (4 * cell)
+        if not playable or not is_game_over(board):
+            boards.append(board)
+    return boards
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if len(values) else 0.0
+
+
+def _result(name, params, metric, value, higher_is_better=True):
+    return {"name": name, "params": params, "metric": metric, "value": float(value),
+            "higher_is_better": higher_is_better}
+
+
+def bench_moves(rng, quick):
+    """Coups par seconde du coup scalaire (move) et du coup en lot (move_batch)."""
+    results = []
+    nb_boards = 2000 if quick else 20000
+    for fill in FILL_LEVELS:
+        boards = boards_with_fill(nb_boards, fill, rng, playable=False)
+
+        start = time.perf_counter()
+        for board in boards:
+            for direction in DIRECTIONS:
+                move(board, direction)
+        elapsed = time.perf_counter() - start
+        results.append(_result("move", {"fill": fill}, "moves_per_s", 4 * nb_boards / elapsed))
+
+        array = np.repeat(np.array(boards, dtype=np.uint64), 4)
+        directions = np.tile(np.arange(4), nb_boards)
+        start = time.perf_counter()
+        move_batch(array, directions)
+        elapsed = time.perf_counter() - start
+        results.append(_result("move_batch", {"fill": fill}, "moves_per_s", len(array) / elapsed))
+    return results
+
+
+def _decisions(name, decide, boards, params):
+    """Latence de chaque décision et simulations par seconde d'un agent Monte Carlo."""
+    latencies = []
+    rollouts = 0
+    for board in boards:
+        game_value = Game_value()
+        game_value.board = board
+        start = time.perf_counter()
+        rollouts += decide(game_value)
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies)
+    return [
+        _result(name, params, "rollouts_per_s", rollouts / total),
+        _result(name, params, "latency_p50_ms", 1000 * _percentile(latencies, 50), False),
+        _result(name, params, "latency_p99_ms", 1000 * _percentile(latencies, 99), False),
+    ]
+
+
+def bench_montecarlo(rng, quick, worker_counts):
+    """Simulations par seconde et latence de décision de montecarlo et testmontecarlo."""
+    from montecarlo.gameIAMontecarlo import testmontecarlo
+    from montecarlo.montecarlo import montecarlo, nbGame
+
+    results = []
+    nb_decisions = 5 if quick else 30
+    for fill in FILL_LEVELS:
+        boards = boards_with_fill(nb_decisions, fill, rng)
+        for workers in worker_counts:
+            pool = workers if workers > 1 else None
+            params = {"fill": fill, "workers": workers}
+            numpy_rng = np.random.default_rng(rng.getrandbits(63))
+
+            def decide_fixed(game_value):
+                montecarlo(game_value, nbGame, numpy_rng, pool)
+                # Seuls les coups légaux sont simulés, et aucun quand il n'y en a qu'un
+                legal = bin(legal_mask(game_value.board)).count("1")
+                return nbGame * legal if legal > 1 else 0
+
+            def decide_adaptive(game_value):
+                _, stats = testmontecarlo(game_value, time_budget=None, rollout_budget=nbGame * len(DIRECTIONS),
+                                          rng=numpy_rng)
+                return sum(stat["rollouts"] for stat in stats.values())
+
+            results += _decisions("montecarlo", decide_fixed, boards, params)
+            if workers == 1:
+                # testmontecarlo joue toujours dans le processus courant
+                results += _decisions("testmontecarlo", decide_adaptive, boards, params)
+    return results
+
+
+def bench_play_individu(rng, quick):
+    """Parties par seconde de play_individu (sans affichage)."""
+    from genetiques.geneticgameIA import play_individu
+    from genetiques.model import generate_population
+
+    nb_games = 50 if quick else 500
+    population = generate_population(nb_games, 20, np.random.default_rng(rng.getrandbits(63)))
+    game_value = Game_value()
+    game_rng = random.Random(rng.getrandbits(63))
+    start = time.perf_counter()
+    for individu in population:
+        play_individu(individu, game_value, rng=game_rng)
+    elapsed = time.perf_counter() - start
+    return [_result("play_individu", {"genome": 20}, "games_per_s", nb_games / elapsed)]
+
+
+def bench_genetique(rng, quick, worker_counts):
+    """Générations par minute de algorithme_genetique (paramètres par défaut, sans affichage)."""
+    from genetiques.geneticgameIA import algorithme_genetique
+
+    generations = 2 if quick else 5
+    results = []
+    for workers in worker_counts:
+        # Sans journal.setup, les événements du journal ne sont pas affichés
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            start = time.perf_counter()
+            algorithme_genetique(Game_value(), generations=generations, resume_from_saved=False, workers=workers,
+                                 seed=rng.getrandbits(63), checkpoint_dir=checkpoint_dir)
+            elapsed = time.perf_counter() - start
+        results.append(_result("algorithme_genetique", {"workers": workers}, "generations_per_min",
+                               60 * generations / elapsed))
+    return results
+
+
+def run(seed=SEED, quick=False, worker_counts=(1,), only=None):
+    """
+    Lance les mesures.
+
+    Args:
+        seed (int): Graine de tous les tirages (plateaux, simulations, parties).
+        quick (bool): True pour des mesures courtes (moins précises).
+        worker_counts (tuple): Nombres de processus testés pour les agents parallèles.
+        only (list): Noms des groupes à lancer (moves, montecarlo, play_individu, genetique), None pour tous.
+
+    Returns:
+        dict: {"meta": ..., "results": [...]}.
+    """
+    rng = random.Random(seed)
+    groups = {
+        "moves": lambda: bench_moves(rng, quick),
+        "montecarlo": lambda: bench_montecarlo(rng, quick, worker_counts),
+        "play_individu": lambda: bench_play_individu(rng, quick),
+        "genetique": lambda: bench_genetique(rng, quick, worker_counts),
+    }
+    results = []
+    for name, bench in groups.items():
+        if only and name not in only:
+            continue
+        print(f"Mesure : {name}", file=sys.stderr)
+        results += bench()
+    meta = {
+        "seed": seed,
+        "quick": quick,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta": meta, "results": results}
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True), result["metric"]
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """
+    Compare deux séries de mesures.
+
+    Args:
+        current (dict): Les mesures du jour (résultat de run).
+        baseline (dict): Les mesures de référence.
+        threshold (float): Dégradation relative tolérée.
+
+    Returns:
+        list: Pour chaque mesure présente des deux côtés, (result, valeur de référence,
+        variation relative, True si régression). La variation est positive quand la
+        mesure s'améliore.
+    """
+    reference = {_key(result): result["value"] for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        old = reference.get(_key(result))
+        if not old:
+            continue
+        change = (result["value"] - old) / old
+        if not result["higher_is_better"]:
+            change = -change
+        rows.append((result, old, change, change < -threshold))
+    return rows
+
+
+def format_results(results):
+    """Tableau texte des mesures."""
+    lines = []
+    for result in results:
+        params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        lines.append(f"{result['name']:<22} {params:<22} {result['metric']:<20} {result['value']:>14.1f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesures de performance de 2048-IA")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--quick", action="store_true", help="mesures courtes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="nombres de processus testés")
+    parser.add_argument("--only", nargs="+", choices=["moves", "montecarlo", "play_individu", "genetique"])
+    parser.add_argument("--output", help="fichier JSON des mesures")
+    parser.add_argument("--compare", metavar="BASELINE", help="fichier JSON de référence")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    report = run(args.seed, args.quick, tuple(sorted(set(args.workers))), args.only)
+    print(format_results(report["results"]))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = 0
+        print()
+        for result, old, change, regression in compare(report, baseline, args.threshold):
+            regressions += regression
+            flag = "RÉGRESSION" if regression else ""
+            params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+            print(f"{result['name']:<22} {params:<22} {result['metric']:<20} {old:>12.1f} -> "
+                  f"{result['value']:>12.1f} ({change:+.1%}) {flag}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,265 @@
+import numpy as np
+from engine.bitboard import FOUR_PROBABILITY, TABLES
+
+# Version vectorisée du moteur : les plateaux sont des tableaux numpy uint64
+# (même codage que engine.bitboard) et les directions des entiers, indices
+# dans DIRECTIONS (0 = left, 1 = right, 2 = up, 3 = down).
+
+LEFT, RIGHT, UP, DOWN = 0, 1, 2, 3
+
+ROW_LEFT = np.frombuffer(TABLES["left"], dtype=np.uint16).astype(np.uint64)
+ROW_RIGHT = np.frombuffer(TABLES["right"], dtype=np.uint16).astype(np.uint64)
+SCORE_LEFT = np.frombuffer(TABLES["score_left"], dtype=np.uint32).astype(np.int64)
+SCORE_RIGHT = np.frombuffer(TABLES["score_right"], dtype=np.uint32).astype(np.int64)
+CHANGED_ANY = (np.frombuffer(TABLES["changed_left"], dtype=np.uint8)
+               | np.frombuffer(TABLES["changed_right"], dtype=np.uint8)).astype(bool)
+
+_ROW_SHIFTS = [np.uint64(16 * i) for i in range(4)]
+_CELL_SHIFTS = np.arange(0, 64, 4, dtype=np.uint64)
+_ROW_MASK = np.uint64(0xFFFF)
+_NIBBLE = np.uint64(0xF)
+
+
+def as_boards(boards):
+    """
+    Returns:
+        numpy.ndarray: The boards as a uint64 array (Python ints are accepted).
+    """
+    return np.asarray(boards, dtype=np.uint64)
+
+
+def transpose_batch(boards):
+    """
+    Swaps rows and columns of every board (same masks as bitboard.transpose).
+
+    Args:
+        boards (numpy.ndarray): The packed boards (uint64).
+
+    Returns:
+        numpy.ndarray: The transposed boards.
+    """
+    a1 = boards & np.uint64(0xF0F00F0FF0F00F0F)
+    a2 = boards & np.uint64(0x0000F0F00000F0F0)
+    a3 = boards & np.uint64(0x0F0F00000F0F0000)
+    a = a1 | (a2 << np.uint64(12)) | (a3 >> np.uint64(12))
+    b1 = a & np.uint64(0xFF00FF0000FF00FF)
+    b2 = a & np.uint64(0x00FF00FF00000000)
+    b3 = a & np.uint64(0x00000000FF00FF00)
+    return b1 | (b2 >> np.uint64(24)) | (b3 << np.uint64(24))
+
+
+def mirror_batch(boards):
+    """
+    Returns:
+        numpy.ndarray: The boards flipped left to right (same masks as symmetry.mirror).
+    """
+    return (((boards & np.uint64(0x000F000F000F000F)) << np.uint64(12))
+            | ((boards & np.uint64(0x00F000F000F000F0)) << np.uint64(4))
+            | ((boards >> np.uint64(4)) & np.uint64(0x00F000F000F000F0))
+            | ((boards >> np.uint64(12)) & np.uint64(0x000F000F000F000F)))
+
+
+def flip_batch(boards):
+    """
+    Returns:
+        numpy.ndarray: The boards flipped top to bottom (same masks as symmetry.flip).
+    """
+    return (((boards & np.uint64(0xFFFF)) << np.uint64(48))
+            | ((boards & np.uint64(0xFFFF0000)) << np.uint64(16))
+            | ((boards >> np.uint64(16)) & np.uint64(0xFFFF0000))
+            | (boards >> np.uint64(48)))
+
+
+def symmetries_batch(boards):
+    """
+    Returns:
+        list: The 8 images of every board, in the order of symmetry.SYMMETRY_MOVES.
+    """
+    boards = as_boards(boards)
+    images = []
+    for base in (boards, transpose_batch(boards)):
+        mirrored = mirror_batch(base)
+        images.extend((base, mirrored, flip_batch(base), flip_batch(mirrored)))
+    return images
+
+
+def move_batch(boards, directions):
+    """
+    Slides and merges N boards, each in its own direction.
+
+    Args:
+        boards (numpy.ndarray): The N packed boards (uint64).
+        directions (numpy.ndarray): The N direction codes (0 to 3).
+
+    Returns:
+        tuple: The N new boards, the N score gains (int64) and the N changed flags.
+    """
+    boards = as_boards(boards)
+    directions = np.asarray(directions)
+    vertical = directions >= UP
+    towards_start = (directions == LEFT) | (directions == UP)
+
+    # Les colonnes deviennent des lignes : une seule passe de tables pour les 4 directions
+    source = np.where(vertical, transpose_batch(boards), boards)
+    new = np.zeros_like(source)
+    gains = np.zeros(len(source), dtype=np.int64)
+    for shift in _ROW_SHIFTS:
+        rows = ((source >> shift) & _ROW_MASK).astype(np.intp)
+        new |= np.where(towards_start, ROW_LEFT[rows], ROW_RIGHT[rows]) << shift
+        gains += np.where(towards_start, SCORE_LEFT[rows], SCORE_RIGHT[rows])
+    new = np.where(vertical, transpose_batch(new), new)
+    return new, gains, new != boards
+
+
+def cells_batch(boards):
+    """
+    Returns:
+        numpy.ndarray: The (N, 16) exponents of every cell, index 4 * row + col.
+    """
+    return (as_boards(boards)[:, None] >> _CELL_SHIFTS) & _NIBBLE
+
+
+def spawn_batch(boards, rng, uniforms=None):
+    """
+    Adds a 2 or a 4 in a random empty cell of every board that is not full.
+
+    Args:
+        boards (numpy.ndarray): The N packed boards (uint64).
+        rng (numpy.random.Generator): The random generator used for the spawns.
+        uniforms (numpy.ndarray): Optional (2, N) uniform draws used instead of rng
+            (cell choice, then tile value), to share random numbers between boards.
+
+    Returns:
+        numpy.ndarray: The N new boards.
+    """
+    boards = as_boards(boards)
+    if uniforms is None:
+        uniforms = rng.random((2, len(boards)))
+    empty = cells_batch(boards) == 0
+    counts = empty.sum(axis=1)
+    # Tirage de la k-ième case vide de chaque plateau
+    picks = (uniforms[0] * counts).astype(np.int64)
+    index = np.argmax(np.cumsum(empty, axis=1) > picks[:, None], axis=1).astype(np.uint64)
+    exponents = np.where(uniforms[1] < FOUR_PROBABILITY, 2, 1).astype(np.uint64)
+    return np.where(counts > 0, boards | (exponents << (np.uint64(4) * index)), boards)
+
+
+def _can_slide_batch(boards):
+    moves = np.zeros(len(boards), dtype=bool)
+    for shift in _ROW_SHIFTS:
+        moves |= CHANGED_ANY[((boards >> shift) & _ROW_MASK).astype(np.intp)]
+    return moves
+
+
+def game_over_mask(boards):
+    """
+    Args:
+        boards (numpy.ndarray): The N packed boards (uint64).
+
+    Returns:
+        numpy.ndarray: True for every board on which no move is possible.
+    """
+    boards = as_boards(boards)
+    return ~(_can_slide_batch(boards) | _can_slide_batch(transpose_batch(boards)))
+
+
+def legal_moves_batch(boards):
+    """
+    Plays the four moves on N boards at once.
+
+    Args:
+        boards (numpy.ndarray): The N packed boards (uint64).
+
+    Returns:
+        tuple: The (N, 4) new boards, the (N, 4) score gains (int64) and the (N, 4)
+        legal flags, columns in DIRECTIONS order. A row without any legal move is a lost game.
+    """
+    boards = as_boards(boards)
+    transposed = transpose_batch(boards)
+    new = np.zeros((len(boards), 4), dtype=np.uint64)
+    gains = np.zeros((len(boards), 4), dtype=np.int64)
+    # Une seule transposition : les lignes du plateau transposé sont les colonnes
+    for first, source in ((LEFT, boards), (UP, transposed)):
+        for shift in _ROW_SHIFTS:
+            rows = ((source >> shift) & _ROW_MASK).astype(np.intp)
+            new[:, first] |= ROW_LEFT[rows] << shift
+            new[:, first + 1] |= ROW_RIGHT[rows] << shift
+            gains[:, first] += SCORE_LEFT[rows]
+            gains[:, first + 1] += SCORE_RIGHT[rows]
+    new[:, UP:] = transpose_batch(new[:, UP:])
+    return new, gains, new != boards[:, None]
+
+
+def play_move_batch(boards, directions, rng, uniforms=None):
+    """
+    Plays a full move on N boards: slide, merge, then spawn.
+
+    As in bitboard.play_move, a move that changes nothing spawns nothing, and
+    the game is lost if no other move can change the board either.
+
+    Args:
+        boards (numpy.ndarray): The N packed boards (uint64).
+        directions (numpy.ndarray): The N direction codes (0 to 3).
+        rng (numpy.random.Generator): The random generator used for the spawns.
+        uniforms (numpy.ndarray): Optional (2, N) uniform draws for the spawns (see spawn_batch).
+
+    Returns:
+        tuple: The N new boards, the N score gains and the N lost flags.
+    """
+    new, gains, changed = move_batch(boards, directions)
+    lost = np.zeros(len(new), dtype=bool)
+    lost[~changed] = game_over_mask(new[~changed])
+    # Les plateaux inchangés ne reçoivent pas de nouvelle tuile
+    return np.where(changed, spawn_batch(new, rng, uniforms), new), gains, lost
+
+
+def random_moves_batch(boards, scores, rng, max_moves=None, streams=None):
+    """
+    Plays random legal moves on N boards in lockstep until every game is lost or max_moves is reached.
+
+    Args:
+        boards (numpy.ndarray): The N packed boards to start from.
+        scores (numpy.ndarray): The N scores already reached.
+        rng (numpy.random.Generator): The random generator used for moves and spawns.
+        max_moves (int): Number of moves after which the games are stopped (None: no limit).
+        streams (numpy.ndarray): Optional random stream index of every game. Games with
+            the same index draw the same moves and spawns (common random numbers).
+
+    Returns:
+        tuple: The N final boards, the N final scores (int64) and the N flags
+        of the games still running.
+    """
+    boards = as_boards(boards).copy()
+    scores = np.array(scores, dtype=np.int64)
+    alive = np.arange(len(boards))
+    if streams is not None:
+        streams = np.asarray(streams)
+        nb_streams = int(streams.max()) + 1 if len(streams) else 0
+    played = 0
+    while len(alive) and (max_moves is None or played < max_moves):
+        new, gains, legal = legal_moves_batch(boards[alive])
+        counts = legal.sum(axis=1)
+        # Une partie sans coup légal est perdue
+        stuck = counts == 0
+        if stuck.any():
+            alive, new, gains, legal, counts = alive[~stuck], new[~stuck], gains[~stuck], legal[~stuck], counts[~stuck]
+            if not len(alive):
+                break
+        if streams is None:
+            draws = rng.random((3, len(alive)))
+        else:
+            # Un tirage par flux et par coup, quel que soit le nombre de parties encore en cours
+            draws = rng.random((3, nb_streams))[:, streams[alive]]
+        # Tirage du k-ième coup légal de chaque partie
+        picks = (draws[0] * counts).astype(np.int64)
+        chosen = np.argmax(np.cumsum(legal, axis=1) > picks[:, None], axis=1)
+        rows = np.arange(len(alive))
+        # Un coup légal libère toujours au moins une case
+        boards[alive] = spawn_batch(new[rows, chosen], rng, draws[1:])
+        scores[alive] += gains[rows, chosen]
+        played += 1
+    # Les parties arrêtées par max_moves sans coup légal restent perdues
+    running = np.zeros(len(boards), dtype=bool)
+    running[alive] = ~game_over_mask(boards[alive])
+    return boards, scores, running
+
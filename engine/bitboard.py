@@ -0,0 +1,438 @@
+import random
+import time
+from engine.instrumentation import STATS
+from engine.tables import MAX_EXPONENT, load_tables
+
+# Plateau 4x4 stocké dans un entier de 64 bits : 4 bits par case, la case
+# (row, col) occupe les bits 16 * row + 4 * col. Chaque case contient
+# l'exposant de la tuile (0 = vide, 1 = 2, 2 = 4, ..., 15 = 32768).
+
+ROWS = 4
+COLS = 4
+
+DIRECTIONS = ["left", "right", "up", "down"]
+
+WIN_VALUE = 2048
+FOUR_PROBABILITY = 0.5  # Même tirage que random.choice([2, 4])
+
+ROW_MASK = 0xFFFF
+
+
+class Game_value:
+    def __init__(self):
+        self.score = 0
+        self.board = 0
+
+    @property
+    def tabOfInfo(self):
+        # [(value,row,col),(value,row,col)]
+        return board_to_tiles(self.board)
+
+    @tabOfInfo.setter
+    def tabOfInfo(self, tab_of_info):
+        self.board = board_from_tiles(tab_of_info)
+
+
+def get_cell(board, row, col):
+    """
+    Returns the exponent stored in a cell.
+
+    Args:
+        board (int): The packed board.
+        row (int): Row of the cell.
+        col (int): Column of the cell.
+
+    Returns:
+        int: The exponent of the tile (0 if the cell is empty).
+    """
+    return (board >> (16 * row + 4 * col)) & 0xF
+
+
+def set_cell(board, row, col, exponent):
+    """
+    Writes an exponent into a cell.
+
+    Args:
+        board (int): The packed board.
+        row (int): Row of the cell.
+        col (int): Column of the cell.
+        exponent (int): The exponent to store (0 empties the cell).
+
+    Returns:
+        int: The new packed board.
+    """
+    shift = 16 * row + 4 * col
+    return (board & ~(0xF << shift)) | (exponent << shift)
+
+
+def board_from_tiles(tab_of_info):
+    """
+    Builds a packed board from a list of (value, row, col) tuples.
+
+    Args:
+        tab_of_info (list): The tiles as (value, row, col) tuples.
+
+    Returns:
+        int: The packed board.
+    """
+    board = 0
+    for value, row, col in tab_of_info:
+        board = set_cell(board, row, col, value.bit_length() - 1)
+    return board
+
+
+def board_to_tiles(board):
+    """
+    Lists the tiles of a packed board.
+
+    Args:
+        board (int): The packed board.
+
+    Returns:
+        list: The tiles as (value, row, col) tuples.
+    """
+    tiles = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            exponent = get_cell(board, row, col)
+            if exponent:
+                tiles.append((1 << exponent, row, col))
+    return tiles
+
+
+def empty_cells(board):
+    """
+    Lists the empty cells of a packed board.
+
+    Args:
+        board (int): The packed board.
+
+    Returns:
+        list: The indices (4 * row + col) of the empty cells.
+    """
+    return [i for i in range(16) if not (board >> (4 * i)) & 0xF]
+
+
+def max_tile(board):
+    """
+    Returns:
+        int: The value of the biggest tile on the board (0 if empty).
+    """
+    exponent = 0
+    while board:
+        exponent = max(exponent, board & 0xF)
+        board >>= 4
+    return 1 << exponent if exponent else 0
+
+
+def spawn(board, rng=random):
+    """
+    Adds a 2 or a 4 in a random empty cell.
+
+    Args:
+        board (int): The packed board.
+        rng (random.Random): The random generator used for the spawn.
+
+    Returns:
+        int: The new packed board (unchanged if the board is full).
+    """
+    cells = empty_cells(board)
+    if not cells:
+        return board
+    index = cells[rng.randrange(len(cells))]
+    exponent = 2 if rng.random() < FOUR_PROBABILITY else 1
+    return board | (exponent << (4 * index))
+
+
+def new_board(rng=random):
+    """
+    Generates the initial board: two tiles of value 2.
+
+    Returns:
+        int: The packed board.
+    """
+    board = 0
+    for _ in range(2):
+        cells = empty_cells(board)
+        board |= 1 << (4 * cells[rng.randrange(len(cells))])
+    return board
+
+
+TABLES = load_tables()
+# Listes plutôt que tableaux : l'accès renvoie directement l'entier Python
+ROW_LEFT = TABLES["left"].tolist()
+ROW_RIGHT = TABLES["right"].tolist()
+SCORE_LEFT = TABLES["score_left"].tolist()
+SCORE_RIGHT = TABLES["score_right"].tolist()
+CHANGED_LEFT = TABLES["changed_left"].tolist()
+CHANGED_RIGHT = TABLES["changed_right"].tolist()
+
+
+def transpose(board):
+    """
+    Swaps rows and columns of a packed board with a few masks and shifts.
+
+    Args:
+        board (int): The packed board.
+
+    Returns:
+        int: The transposed board.
+    """
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _slide(board, rows, scores):
+    """
+    Applies a row table to the four rows of a board.
+
+    Returns:
+        tuple: The new packed board and the score gained.
+    """
+    r0 = board & ROW_MASK
+    r1 = (board >> 16) & ROW_MASK
+    r2 = (board >> 32) & ROW_MASK
+    r3 = board >> 48
+    new = rows[r0] | (rows[r1] << 16) | (rows[r2] << 32) | (rows[r3] << 48)
+    return new, scores[r0] + scores[r1] + scores[r2] + scores[r3]
+
+
+def move(board, direction):
+    """
+    Slides and merges every tile of the board in the given direction.
+
+    Args:
+        board (int): The packed board.
+        direction (str): The direction of movement ("left", "right", "up", "down").
+
+    Returns:
+        tuple: The new packed board and the score gained by the merges.
+    """
+    if direction == "left":
+        return _slide(board, ROW_LEFT, SCORE_LEFT)
+    if direction == "right":
+        return _slide(board, ROW_RIGHT, SCORE_RIGHT)
+
+    # Une colonne devient une ligne après transposition : haut = gauche
+    if direction == "up":
+        new, gain = _slide(transpose(board), ROW_LEFT, SCORE_LEFT)
+    else:
+        new, gain = _slide(transpose(board), ROW_RIGHT, SCORE_RIGHT)
+    return transpose(new), gain
+
+
+def _line_cells(direction, line):
+    """
+    Returns:
+        list: The four cells of a row or column, starting from the side the tiles slide to.
+    """
+    if direction == "left":
+        return [(line, col) for col in range(COLS)]
+    if direction == "right":
+        return [(line, col) for col in reversed(range(COLS))]
+    if direction == "up":
+        return [(row, line) for row in range(ROWS)]
+    return [(row, line) for row in reversed(range(ROWS))]
+
+
+def move_with_transitions(board, direction):
+    """
+    Slides the board and describes where every tile went, for the animations.
+
+    Args:
+        board (int): The packed board.
+        direction (str): The direction of movement ("left", "right", "up", "down").
+
+    Returns:
+        tuple: The new packed board, the score gained and the list of transitions
+        ((from_row, from_col), (to_row, to_col), merged), one per tile of the
+        original board. merged is True for the tile absorbed by the merge.
+    """
+    new, gain = move(board, direction)
+    transitions = []
+    for line in range(4):
+        cells = _line_cells(direction, line)
+        target = -1
+        target_exponent = 0
+        target_merged = False
+        for row, col in cells:
+            exponent = get_cell(board, row, col)
+            if not exponent:
+                continue
+            if (exponent == target_exponent and not target_merged
+                    and exponent < MAX_EXPONENT):
+                transitions.append(((row, col), cells[target], True))
+                target_merged = True
+            else:
+                target += 1
+                target_exponent = exponent
+                target_merged = False
+                transitions.append(((row, col), cells[target], False))
+    return new, gain, transitions
+
+
+def legal_mask(board):
+    """
+    Finds the moves that change the board, from the row tables only (no board is built).
+
+    Returns:
+        int: Bit i is set when DIRECTIONS[i] is legal; 0 means that the game is lost.
+    """
+    transposed = transpose(board)
+    mask = 0
+    for shift in (0, 16, 32, 48):
+        row = (board >> shift) & ROW_MASK
+        column = (transposed >> shift) & ROW_MASK
+        mask |= CHANGED_LEFT[row] | (CHANGED_RIGHT[row] << 1) | (CHANGED_LEFT[column] << 2) | (CHANGED_RIGHT[column] << 3)
+    return mask
+
+
+def legal_moves(board):
+    """
+    Plays the four moves at once and keeps those that change the board.
+
+    Args:
+        board (int): The packed board.
+
+    Returns:
+        list: (direction, new_board, gain) for every legal move, in DIRECTIONS order.
+        An empty list means that the game is lost.
+    """
+    moves = []
+    new, gain = _slide(board, ROW_LEFT, SCORE_LEFT)
+    if new != board:
+        moves.append(("left", new, gain))
+    new, gain = _slide(board, ROW_RIGHT, SCORE_RIGHT)
+    if new != board:
+        moves.append(("right", new, gain))
+
+    # Une seule transposition pour les deux coups verticaux
+    transposed = transpose(board)
+    new, gain = _slide(transposed, ROW_LEFT, SCORE_LEFT)
+    if new != transposed:
+        moves.append(("up", transpose(new), gain))
+    new, gain = _slide(transposed, ROW_RIGHT, SCORE_RIGHT)
+    if new != transposed:
+        moves.append(("down", transpose(new), gain))
+    return moves
+
+
+def is_game_over(board):
+    """
+    Checks if no move can change the board anymore.
+
+    Returns:
+        bool: True if the game is lost.
+    """
+    return not legal_mask(board)
+
+
+def play_move(board, direction, rng=random):
+    """
+    Plays a full move: slide, merge, then spawn of a new tile.
+
+    A move that changes nothing spawns nothing: the board is returned as is,
+    and the game is lost if no other move can change it either.
+
+    Args:
+        board (int): The packed board.
+        direction (str): The direction of movement ("left", "right", "up", "down").
+        rng (random.Random): The random generator used for the spawn.
+
+    Returns:
+        tuple: The new packed board, the score gained and True if the game is lost.
+    """
+    new, gain = move(board, direction)
+    if new == board:
+        return board, 0, is_game_over(board)
+    # Un coup qui change le plateau libère toujours au moins une case
+    return spawn(new, rng), gain, False
+
+
+def finish_move(game_value, board, gain, rng=random):
+    """
+    Applies the result of a slide to a game: score, win check, then spawn.
+
+    The slide must start from game_value.board: a slide that changed nothing
+    spawns no tile.
+
+    Args:
+        game_value (Game_value): The game to update.
+        board (int): The packed board after the slide.
+        gain (int): The score gained by the slide.
+        rng (random.Random): The random generator used for the spawn.
+
+    Returns:
+        str: "continue" if the game continues, or "lost" if the game is over.
+    """
+    # Chemin chaud : un test de booléen quand l'instrumentation est éteinte
+    timed = STATS.enabled
+    if timed:
+        start = time.perf_counter()
+    changed = board != game_value.board
+    game_value.score += gain
+    game_value.board = board
+    # Victoire, ou coup sans effet sur une grille où aucun coup n'est possible
+    over = max_tile(board) >= WIN_VALUE if changed else is_game_over(board)
+    if timed:
+        start = STATS.lap("game_over", start)
+    if over:
+        return "lost"
+    if not changed:
+        return "continue"  # Pas de nouvelle tuile après un coup sans effet
+
+    # Génère la nouvelle tuile
+    game_value.board = spawn(board, rng)
+    if timed:
+        STATS.lap("spawn", start)
+
+    return "continue"
+
+
+def apply_move(game_value, direction, rng=random):
+    """
+    Plays a move on a game without any rendering.
+
+    Args:
+        game_value (Game_value): The game to update.
+        direction (str): The direction of movement ("left", "right", "up", "down").
+        rng (random.Random): The random generator used for the spawn.
+
+    Returns:
+        str: "continue" if the game continues, or "lost" if the game is over.
+    """
+    timed = STATS.enabled
+    if timed:
+        start = time.perf_counter()
+    board, gain = move(game_value.board, direction)
+    if timed:
+        STATS.lap("move", start)
+    return finish_move(game_value, board, gain, rng)
+
+
+def random_game(board, score=0, rng=random):
+    """
+    Plays random moves until the game is lost.
+
+    Args:
+        board (int): The packed board to start from.
+        score (int): The score already reached on this board.
+        rng (random.Random): The random generator used for moves and spawns.
+
+    Returns:
+        int: The final score.
+    """
+    while True:
+        # Tirage parmi les seuls coups légaux ; aucun : la partie est perdue
+        moves = legal_moves(board)
+        if not moves:
+            return score
+        _, board, gain = moves[rng.randrange(len(moves))]
+        score += gain
+        board = spawn(board, rng)
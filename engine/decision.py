@@ -0,0 +1,113 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from engine.bitboard import Game_value
+
+# Décisions de l'IA hors du thread de la fenêtre : la recherche tourne dans un
+# thread de l'agent et rend un futur, la boucle pygame continue de traiter
+# ses événements. Chaque décision a un événement d'arrêt, levé par cancel()
+# ou à l'échéance (deadline) : les recherches qui le reçoivent (montecarlo_adaptatif,
+# expectimax) s'arrêtent au plus tôt et rendent le meilleur coup trouvé.
+
+
+class Deadline:
+    """
+    Échéance utilisable comme événement d'arrêt d'une recherche, sans thread :
+    is_set() devient vrai une fois le délai écoulé.
+    """
+
+    def __init__(self, seconds):
+        self.end = time.perf_counter() + seconds
+
+    def is_set(self):
+        return time.perf_counter() >= self.end
+
+
+class Decision:
+    """Une décision en cours : son futur, son événement d'arrêt et son échéance."""
+
+    def __init__(self, future, stop, deadline=None):
+        self.future = future
+        self.stop = stop
+        self.deadline = deadline
+
+    def done(self):
+        """
+        Lève l'arrêt si l'échéance est dépassée.
+
+        Returns:
+            bool: True quand la direction est disponible.
+        """
+        if self.deadline is not None and not self.stop.is_set() and time.perf_counter() >= self.deadline:
+            self.stop.set()
+        return self.future.done()
+
+    def wait(self, timeout):
+        """
+        Attend la décision au plus timeout secondes (rend la main dès qu'elle est prête).
+
+        Returns:
+            bool: True quand la direction est disponible.
+        """
+        if self.done():
+            return True
+        if self.deadline is not None and not self.stop.is_set():
+            timeout = max(0.0, min(timeout, self.deadline - time.perf_counter()))
+        wait([self.future], timeout)
+        return self.done()
+
+    def cancel(self):
+        """Demande l'arrêt de la recherche (sans attendre sa fin)."""
+        self.stop.set()
+        self.future.cancel()
+
+    def result(self, timeout=None):
+        """
+        Returns:
+            Le résultat de l'agent, None s'il a été annulé avant de commencer.
+        """
+        if self.future.cancelled():
+            return None
+        return self.future.result(timeout)
+
+
+class AsyncAgent:
+    """
+    Lance les décisions d'un agent dans un thread dédié.
+
+    Args:
+        decide (callable): L'agent : (game_value, stop) -> direction (ou tout autre
+            résultat), stop étant un threading.Event à consulter pendant la recherche.
+        deadline (float): Temps maximal d'une décision, en secondes, après lequel
+            l'arrêt est demandé ; None pour attendre la fin de la recherche.
+    """
+
+    def __init__(self, decide, deadline=None):
+        self.decide = decide
+        self.deadline = deadline
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent")
+        self.current = None
+
+    def submit(self, game_value):
+        """
+        Lance la décision sur une copie de la partie (la fenêtre peut continuer de la lire).
+
+        Returns:
+            Decision: La décision en cours.
+        """
+        snapshot = Game_value()
+        snapshot.board, snapshot.score = game_value.board, game_value.score
+        stop = threading.Event()
+        deadline = None if self.deadline is None else time.perf_counter() + self.deadline
+        self.current = Decision(self.executor.submit(self.decide, snapshot, stop), stop, deadline)
+        return self.current
+
+    def cancel(self):
+        """Arrête la décision en cours, s'il y en a une."""
+        if self.current is not None:
+            self.current.cancel()
+
+    def close(self):
+        """Arrête la décision en cours et libère le thread sans attendre."""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
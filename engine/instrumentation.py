@@ -0,0 +1,302 @@
+import argparse
+import atexit
+import contextlib
+import cProfile
+import json
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+
+# Compteurs et chronomètres par phase (coup, apparition, rendu, simulations,
+# cache, phases de l'algorithme génétique...), activables pendant l'exécution.
+# Désactivés, chaque point de mesure ne coûte qu'un test d'attribut et rend un
+# gestionnaire de contexte vide partagé.
+#
+# Chaque thread a ses propres compteurs (l'agent du mode spectateur et la
+# boucle d'affichage ne se mélangent pas) ; le rapport les additionne. Les
+# compteurs d'un autre processus s'ajoutent avec export() et merge().
+
+_NULL = contextlib.nullcontext()
+
+
+class _Phase:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        accumulator = self.stats.current()
+        accumulator.calls[self.name] += 1
+        accumulator.seconds[self.name] += time.perf_counter() - self.start
+
+
+class _Scope:
+    """
+    Mesure ce qui s'est passé pendant une décision ou une génération (différence
+    des compteurs du thread qui l'a ouverte).
+    """
+
+    def __init__(self, stats, kind):
+        self.stats = stats
+        self.kind = kind
+
+    def __enter__(self):
+        self.accumulator = self.stats.current()
+        self.start = time.perf_counter()
+        self.calls = dict(self.accumulator.calls)
+        self.seconds = dict(self.accumulator.seconds)
+        return self
+
+    def __exit__(self, *exc):
+        stats = self.accumulator
+        summary = {"duration": time.perf_counter() - self.start}
+        for name, calls in stats.calls.items():
+            calls -= self.calls.get(name, 0)
+            if calls:
+                # get : les simples compteurs (STATS.count) n'ont pas d'entrée dans seconds
+                summary[name] = (calls, stats.seconds.get(name, 0.0) - self.seconds.get(name, 0.0))
+        stats.scopes[self.kind].append(summary)
+
+
+class _Accumulator:
+    """Les compteurs d'un thread : appels et temps par phase, résumés par portée."""
+
+    __slots__ = ("calls", "seconds", "scopes")
+
+    def __init__(self, calls=(), seconds=(), scopes=()):
+        self.calls = defaultdict(int, calls)
+        self.seconds = defaultdict(float, seconds)
+        self.scopes = defaultdict(list, scopes)
+
+
+class Instrumentation:
+    """
+    Compteurs (nombre d'appels) et temps cumulés par phase, avec un regroupement
+    par portée : chaque décision ou génération enregistre ce qui s'est passé
+    pendant sa durée.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Remet tous les compteurs à zéro, dans tous les threads."""
+        with self._lock:
+            self._local = threading.local()
+            self._accumulators = []
+
+    def current(self):
+        """
+        Returns:
+            _Accumulator: Les compteurs du thread courant, créés au premier appel.
+        """
+        try:
+            return self._local.accumulator
+        except AttributeError:
+            accumulator = _Accumulator()
+            with self._lock:
+                self._accumulators.append(accumulator)
+            self._local.accumulator = accumulator
+            return accumulator
+
+    def merged(self):
+        """
+        Returns:
+            _Accumulator: La somme des compteurs de tous les threads (et des processus ajoutés par merge).
+        """
+        total = _Accumulator()
+        with self._lock:
+            accumulators = list(self._accumulators)
+        for accumulator in accumulators:
+            # dict() copie d'un bloc : le thread propriétaire peut continuer d'écrire
+            for name, calls in dict(accumulator.calls).items():
+                total.calls[name] += calls
+            for name, seconds in dict(accumulator.seconds).items():
+                total.seconds[name] += seconds
+            for kind, summaries in dict(accumulator.scopes).items():
+                total.scopes[kind].extend(list(summaries))
+        return total
+
+    def export(self):
+        """
+        Returns:
+            dict: Les compteurs de ce processus, à transmettre à merge() dans un autre.
+        """
+        total = self.merged()
+        return {"calls": dict(total.calls), "seconds": dict(total.seconds), "scopes": dict(total.scopes)}
+
+    def merge(self, exported):
+        """Ajoute les compteurs rendus par export() dans un autre processus."""
+        accumulator = _Accumulator(exported["calls"], exported["seconds"], exported["scopes"])
+        with self._lock:
+            self._accumulators.append(accumulator)
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def phase(self, name):
+        """
+        Chronomètre une phase : with STATS.phase("spawn"): ...
+
+        Returns:
+            Un gestionnaire de contexte (vide si l'instrumentation est désactivée).
+        """
+        if not self.enabled:
+            return _NULL
+        return _Phase(self, name)
+
+    def lap(self, name, start):
+        """
+        Ajoute le temps écoulé depuis start à la phase name, pour les chemins les plus
+        chauds où l'appelant teste lui-même STATS.enabled plutôt qu'ouvrir un with.
+
+        Returns:
+            float: L'instant présent (time.perf_counter), début de la phase suivante.
+        """
+        now = time.perf_counter()
+        accumulator = self.current()
+        accumulator.calls[name] += 1
+        accumulator.seconds[name] += now - start
+        return now
+
+    def count(self, name, amount=1):
+        """Ajoute amount au compteur name, sans mesure de temps."""
+        if self.enabled:
+            self.current().calls[name] += amount
+
+    def scope(self, kind):
+        """
+        Regroupe les mesures d'une décision ou d'une génération : with STATS.scope("decision"): ...
+        """
+        if not self.enabled:
+            return _NULL
+        return _Scope(self, kind)
+
+    def report(self, total=None):
+        """
+        Args:
+            total (_Accumulator): Les compteurs à résumer, merged() par défaut.
+
+        Returns:
+            dict: {"phases": {nom: {"calls", "seconds"}}, "scopes": {type: {"count",
+            "mean_seconds", "phases": {nom: {"calls_per_scope", "ms_per_scope", "max_ms"}}}}}.
+        """
+        if total is None:
+            total = self.merged()
+        phases = {name: {"calls": calls, "seconds": total.seconds.get(name, 0.0)}
+                  for name, calls in sorted(total.calls.items())}
+        scopes = {}
+        for kind, summaries in total.scopes.items():
+            count = len(summaries)
+            names = sorted({name for summary in summaries for name in summary if name != "duration"})
+            scopes[kind] = {
+                "count": count,
+                "mean_seconds": sum(summary["duration"] for summary in summaries) / count,
+                "phases": {
+                    name: {
+                        "calls_per_scope": sum(summary.get(name, (0, 0.0))[0] for summary in summaries) / count,
+                        "ms_per_scope": 1000 * sum(summary.get(name, (0, 0.0))[1] for summary in summaries) / count,
+                        "max_ms": 1000 * max(summary.get(name, (0, 0.0))[1] for summary in summaries),
+                    }
+                    for name in names
+                },
+            }
+        return {"phases": phases, "scopes": scopes}
+
+    def format_table(self):
+        """Le rapport sous forme de tableau texte."""
+        total = self.merged()
+        report = self.report(total)
+        lines = [f"{'phase':<20} {'appels':>10} {'total ms':>12} {'µs/appel':>10}"]
+        for name, phase in report["phases"].items():
+            if name not in total.seconds:
+                # Simple compteur (STATS.count), sans mesure de temps
+                lines.append(f"{name:<20} {phase['calls']:>10}")
+                continue
+            per_call = 1e6 * phase["seconds"] / phase["calls"] if phase["calls"] else 0.0
+            lines.append(f"{name:<20} {phase['calls']:>10} {1000 * phase['seconds']:>12.1f} {per_call:>10.1f}")
+        for kind, scope in report["scopes"].items():
+            lines.append("")
+            lines.append(f"Par {kind} ({scope['count']}, {1000 * scope['mean_seconds']:.1f} ms en moyenne)")
+            lines.append(f"{'phase':<20} {'appels':>10} {'ms':>12} {'max ms':>10}")
+            for name, phase in scope["phases"].items():
+                if name not in total.seconds:
+                    lines.append(f"{name:<20} {phase['calls_per_scope']:>10.1f}")
+                    continue
+                lines.append(f"{name:<20} {phase['calls_per_scope']:>10.1f} {phase['ms_per_scope']:>12.2f} "
+                             f"{phase['max_ms']:>10.2f}")
+        return "\n".join(lines)
+
+    def dump(self, fmt="table", file_name=None):
+        """Écrit le rapport (table ou json) dans file_name, ou sur la sortie d'erreur."""
+        text = self.format_table() if fmt == "table" else json.dumps(self.report(), indent=2)
+        if file_name is None:
+            print(text, file=sys.stderr)
+        else:
+            with open(file_name, "w") as f:
+                f.write(text + "\n")
+
+
+STATS = Instrumentation()
+
+
+def add_arguments(parser):
+    """Ajoute les options --stats, --stats-file et --profile à un analyseur argparse."""
+    parser.add_argument("--stats", choices=["table", "json"],
+                        help="compteurs et temps par phase, affichés à la sortie (les processus d'un pool ne "
+                             "sont comptés que par python -m play.play)")
+    parser.add_argument("--stats-file", help="fichier du rapport --stats (sortie d'erreur par défaut)")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="FILE",
+                        help="profil cProfile, affiché à la sortie ou enregistré dans FILE (format pstats)")
+
+
+def setup(stats=None, stats_file=None, profile=None):
+    """
+    Active l'instrumentation et/ou le profilage jusqu'à la fin du programme.
+
+    Args:
+        stats (str): "table" ou "json" pour activer les compteurs, None pour les laisser éteints.
+        stats_file (str): Fichier du rapport, None pour la sortie d'erreur.
+        profile (str): "-" pour afficher le profil cProfile à la sortie, un nom de
+            fichier pour l'enregistrer, None pour ne pas profiler.
+    """
+    if stats:
+        STATS.enable()
+        atexit.register(STATS.dump, stats, stats_file)
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def dump_profile():
+            profiler.disable()
+            if profile == "-":
+                pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(30)
+            else:
+                profiler.dump_stats(profile)
+
+        atexit.register(dump_profile)
+
+
+def configure(argv=None):
+    """
+    Lit --stats, --stats-file et --profile dans argv (sys.argv par défaut) et
+    ignore les autres options : utilisable depuis main.py comme depuis les
+    modules lancés sans affichage.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    setup(args.stats, args.stats_file, args.profile)
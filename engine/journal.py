@@ -0,0 +1,152 @@
+import argparse
+import json
+import logging
+import logging.handlers
+import sys
+import time
+from engine.bitboard import max_tile
+
+# Journal structuré des parties et des entraînements : un événement par partie,
+# décision ou génération, avec ses champs (score, tuile max, coups...).
+# La console reçoit une ligne lisible par événement ; le fichier, des lignes
+# JSON, écrites par paquets (MemoryHandler) et renouvelées par taille.
+# Le détail coup par coup est au niveau DEBUG et n'est produit que sur demande.
+
+LOGGER = logging.getLogger("ia2048")
+LOGGER.addHandler(logging.NullHandler())
+
+LOG_FILE = "ia2048.jsonl"
+MAX_BYTES = 10 * 1024 * 1024  # Taille d'un fichier avant renouvellement
+BACKUP_COUNT = 3  # Nombre d'anciens fichiers conservés
+BUFFER_SIZE = 1000  # Événements gardés en mémoire avant écriture
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+
+
+def log_event(event, level=INFO, **fields):
+    """
+    Enregistre un événement.
+
+    Args:
+        event (str): Le nom de l'événement ("game", "generation", "move"...).
+        level (int): Le niveau (DEBUG, INFO, WARNING).
+        **fields: Les champs de l'événement (valeurs sérialisables en JSON).
+    """
+    if LOGGER.isEnabledFor(level):
+        LOGGER.log(level, event, extra={"fields": fields})
+
+
+def tracing():
+    """
+    Returns:
+        bool: True si le détail coup par coup est demandé (niveau DEBUG) ; à tester
+        avant de préparer un événement "move" dans une boucle de jeu.
+    """
+    return LOGGER.isEnabledFor(DEBUG)
+
+
+def _format_value(value):
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Une ligne lisible : événement puis champs clé=valeur."""
+
+    def format(self, record):
+        fields = getattr(record, "fields", {})
+        text = " ".join(f"{key}={_format_value(value)}" for key, value in fields.items())
+        return f"{record.getMessage()} {text}".rstrip()
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par événement : heure, niveau, événement et champs."""
+
+    def format(self, record):
+        entry = {"time": round(record.created, 3), "level": record.levelname, "event": record.getMessage()}
+        entry.update(getattr(record, "fields", {}))
+        return json.dumps(entry, default=float)
+
+
+def add_arguments(parser):
+    """Ajoute les options --log-level, --log-file et --trace-moves à un analyseur argparse."""
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING"],
+                        help="niveau des messages de la console")
+    parser.add_argument("--log-file", nargs="?", const=LOG_FILE, metavar="FILE",
+                        help=f"journal JSON-lines, renouvelé par taille ({LOG_FILE} par défaut)")
+    parser.add_argument("--trace-moves", action="store_true", help="journalise chaque coup (niveau DEBUG)")
+
+
+def setup(level="INFO", file_name=None, trace_moves=False, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT,
+          console=True):
+    """
+    Installe la sortie console et, si file_name est donné, le fichier JSON-lines.
+
+    Args:
+        level (str): Niveau minimal de la console.
+        file_name (str): Fichier du journal, None pour ne rien écrire sur disque.
+        trace_moves (bool): True pour produire aussi les événements coup par coup.
+        max_bytes (int): Taille d'un fichier avant renouvellement.
+        backup_count (int): Nombre d'anciens fichiers conservés.
+        console (bool): False pour ne rien afficher.
+    """
+    for handler in list(LOGGER.handlers):
+        LOGGER.removeHandler(handler)
+        handler.close()
+    LOGGER.propagate = False
+    LOGGER.setLevel(DEBUG if trace_moves else min(logging.getLevelName(level), INFO))
+
+    if console:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setLevel(DEBUG if trace_moves else level)
+        handler.setFormatter(ConsoleFormatter())
+        LOGGER.addHandler(handler)
+    if file_name:
+        target = logging.handlers.RotatingFileHandler(file_name, maxBytes=max_bytes, backupCount=backup_count)
+        target.setFormatter(JsonFormatter())
+        # Écriture par paquets : vidé quand le tampon est plein, sur un avertissement et à la sortie
+        LOGGER.addHandler(logging.handlers.MemoryHandler(BUFFER_SIZE, WARNING, target))
+    if not LOGGER.handlers:
+        LOGGER.addHandler(logging.NullHandler())
+
+
+def configure(argv=None):
+    """
+    Lit --log-level, --log-file et --trace-moves dans argv (sys.argv par défaut),
+    en ignorant les autres options, puis appelle setup.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    setup(args.log_level, args.log_file, args.trace_moves)
+
+
+class GameLog:
+    """
+    Résumé d'une partie : coups joués, temps de décision, score et tuile maximale,
+    enregistré en un seul événement "game" à la fin.
+    """
+
+    def __init__(self, agent, **fields):
+        self.agent = agent
+        self.fields = fields
+        self.moves = 0
+        self.decision_seconds = 0.0
+        self.start = time.perf_counter()
+        self.trace = tracing()
+
+    def move(self, game_value, direction, decision_seconds=0.0, **fields):
+        """Compte un coup ; l'événement "move" n'est produit qu'en mode trace."""
+        self.moves += 1
+        self.decision_seconds += decision_seconds
+        if self.trace:
+            log_event("move", DEBUG, agent=self.agent, move=self.moves, direction=direction,
+                      score=game_value.score, **fields)
+
+    def end(self, game_value):
+        """Enregistre le résumé de la partie."""
+        duration = time.perf_counter() - self.start
+        log_event("game", INFO, agent=self.agent, score=game_value.score, max_tile=max_tile(game_value.board),
+                  moves=self.moves, seconds=round(duration, 3),
+                  decision_ms=round(1000 * self.decision_seconds / max(self.moves, 1), 3), **self.fields)
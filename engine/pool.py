@@ -0,0 +1,48 @@
+import atexit
+import multiprocessing
+
+# Pools de processus partagés par les simulations Monte Carlo, l'évaluation
+# des populations génétiques et les parties en lot (play.play).
+
+_sessions = {}  # Pools de la session par nom : (pool, nombre de processus)
+
+
+def make_pool(workers, initializer=None, initargs=()):
+    """
+    Crée un pool de workers processus.
+
+    Args:
+        workers (int): Nombre de processus.
+        initializer (callable): Fonction appelée au démarrage de chaque processus.
+        initargs (tuple): Ses arguments.
+
+    Returns:
+        multiprocessing.pool.Pool: Le pool, à fermer par l'appelant.
+    """
+    # fork évite de réimporter le module principal dans chaque processus ; avec
+    # spawn, il est réimporté : les points d'entrée (main.py) gardent leur code
+    # sous if __name__ == "__main__"
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    return context.Pool(workers, initializer=initializer, initargs=initargs)
+
+
+def session_pool(name, workers, create=make_pool):
+    """
+    Le pool nommé name de la session, créé au premier appel par create(workers),
+    recréé si le nombre de processus change et fermé à la sortie.
+
+    Args:
+        name (str): Le nom du pool (un pool par usage).
+        workers (int): Nombre de processus.
+        create (callable): workers -> pool ; le pool doit avoir une méthode close().
+    """
+    pool, pool_workers = _sessions.get(name, (None, 0))
+    if pool is None or pool_workers != workers:
+        if pool is not None:
+            pool.close()
+            atexit.unregister(pool.close)
+        pool = create(workers)
+        _sessions[name] = (pool, workers)
+        atexit.register(pool.close)
+    return pool
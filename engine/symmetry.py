@@ -0,0 +1,89 @@
+from engine.bitboard import transpose
+
+# Les 8 symétries du carré (rotations et réflexions) donnent des positions
+# équivalentes, à une permutation des coups près. Toutes les opérations se
+# font sur le plateau compacté, avec des masques et des décalages.
+
+# Permutations des coups (indices dans DIRECTIONS : left, right, up, down)
+_TRANSPOSE_MOVES = (2, 3, 0, 1)
+_MIRROR_MOVES = (1, 0, 2, 3)
+_FLIP_MOVES = (0, 1, 3, 2)
+_IDENTITY_MOVES = (0, 1, 2, 3)
+
+
+def mirror(board):
+    """
+    Returns:
+        int: Le plateau retourné de gauche à droite (colonnes inversées).
+    """
+    return (((board & 0x000F000F000F000F) << 12) | ((board & 0x00F000F000F000F0) << 4)
+            | ((board >> 4) & 0x00F000F000F000F0) | ((board >> 12) & 0x000F000F000F000F))
+
+
+def flip(board):
+    """
+    Returns:
+        int: Le plateau retourné de haut en bas (lignes inversées).
+    """
+    return (((board & 0xFFFF) << 48) | ((board & 0xFFFF0000) << 16)
+            | ((board >> 16) & 0xFFFF0000) | (board >> 48))
+
+
+def _compose(first, second):
+    return tuple(second[move] for move in first)
+
+
+# Pour chaque symétrie : la permutation qui envoie un coup du plateau d'origine
+# sur le coup équivalent du plateau transformé
+SYMMETRY_MOVES = [
+    _compose(pre, post)
+    for pre in (_IDENTITY_MOVES, _TRANSPOSE_MOVES)
+    for post in (_IDENTITY_MOVES, _MIRROR_MOVES, _FLIP_MOVES, _compose(_MIRROR_MOVES, _FLIP_MOVES))
+]
+# Et la permutation inverse, du plateau transformé vers le plateau d'origine
+INVERSE_MOVES = [
+    tuple(moves.index(move) for move in range(4)) for moves in SYMMETRY_MOVES
+]
+
+
+def symmetries(board):
+    """
+    Args:
+        board (int): Le plateau compacté.
+
+    Returns:
+        list: Les 8 images du plateau, dans l'ordre de SYMMETRY_MOVES.
+    """
+    images = []
+    for base in (board, transpose(board)):
+        mirrored = mirror(base)
+        images.extend((base, mirrored, flip(base), flip(mirrored)))
+    return images
+
+
+def canonical_board(board):
+    """
+    Returns:
+        int: Le représentant canonique du plateau (la plus petite de ses 8 images).
+    """
+    transposed = transpose(board)
+    mirrored = mirror(board)
+    transposed_mirrored = mirror(transposed)
+    return min(board, mirrored, flip(board), flip(mirrored),
+               transposed, transposed_mirrored, flip(transposed), flip(transposed_mirrored))
+
+
+def canonical(board):
+    """
+    Ramène un plateau à sa forme canonique.
+
+    Args:
+        board (int): Le plateau compacté.
+
+    Returns:
+        tuple: Le plateau canonique, la permutation to_canonical (coup d'origine ->
+        coup sur le plateau canonique) et la permutation inverse from_canonical.
+    """
+    images = symmetries(board)
+    index = min(range(8), key=images.__getitem__)
+    return images[index], SYMMETRY_MOVES[index], INVERSE_MOVES[index]
@@ -0,0 +1,139 @@
+import os
+from array import array
+
+# Tables de transition des lignes : pour chacune des 65536 lignes de 16 bits
+# possibles, la ligne obtenue après un glissement à gauche ou à droite, le
+# score gagné par les fusions et un drapeau indiquant si la ligne a changé.
+# Les tables sont calculées une seule fois puis relues depuis TABLES_FILE.
+
+MAX_EXPONENT = 15
+NB_ROWS = 1 << 16
+
+TABLES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables.bin")
+_MAGIC = b"2048TBL1"
+
+
+def slide_row_left(row):
+    """
+    Slides and merges a 16-bit row towards column 0.
+
+    Args:
+        row (int): The row, one 4-bit exponent per cell, column 0 in the low bits.
+
+    Returns:
+        tuple: The new row and the score gained by the merges.
+    """
+    line = [(row >> (4 * i)) & 0xF for i in range(4)]
+    line = [exponent for exponent in line if exponent]
+    result = []
+    gain = 0
+    i = 0
+    while i < len(line):
+        if i + 1 < len(line) and line[i] == line[i + 1] and line[i] < MAX_EXPONENT:
+            result.append(line[i] + 1)
+            gain += 1 << (line[i] + 1)
+            i += 2
+        else:
+            result.append(line[i])
+            i += 1
+    new_row = 0
+    for i, exponent in enumerate(result):
+        new_row |= exponent << (4 * i)
+    return new_row, gain
+
+
+def reverse_row(row):
+    """
+    Returns:
+        int: The row with its four cells in reverse order.
+    """
+    return ((row & 0xF) << 12) | ((row & 0xF0) << 4) | ((row >> 4) & 0xF0) | (row >> 12)
+
+
+def build_tables():
+    """
+    Computes the transition tables of every possible row.
+
+    Returns:
+        dict: The arrays "left", "right" (new rows), "score_left", "score_right"
+        (score gained) and "changed_left", "changed_right" (1 if the row moved).
+    """
+    tables = {
+        "left": array("H", bytes(2 * NB_ROWS)),
+        "right": array("H", bytes(2 * NB_ROWS)),
+        "score_left": array("I", bytes(4 * NB_ROWS)),
+        "score_right": array("I", bytes(4 * NB_ROWS)),
+        "changed_left": array("B", bytes(NB_ROWS)),
+        "changed_right": array("B", bytes(NB_ROWS)),
+    }
+    for row in range(NB_ROWS):
+        left, gain = slide_row_left(row)
+        tables["left"][row] = left
+        tables["score_left"][row] = gain
+        tables["changed_left"][row] = left != row
+
+        # Glisser à droite revient à glisser à gauche la ligne inversée
+        reversed_row = reverse_row(row)
+        right, gain = slide_row_left(reversed_row)
+        right = reverse_row(right)
+        tables["right"][row] = right
+        tables["score_right"][row] = gain
+        tables["changed_right"][row] = right != row
+    return tables
+
+
+_ORDER = ["left", "right", "score_left", "score_right", "changed_left", "changed_right"]
+_TYPECODES = {"left": "H", "right": "H", "score_left": "I", "score_right": "I",
+              "changed_left": "B", "changed_right": "B"}
+
+
+def save_tables(tables, file_name=TABLES_FILE):
+    """
+    Writes the tables to a binary file (raw arrays after a short header).
+    """
+    # Écriture dans un fichier temporaire puis renommage, pour qu'un autre
+    # processus ne lise jamais un fichier à moitié écrit
+    temp_name = f"{file_name}.{os.getpid()}.tmp"
+    with open(temp_name, "wb") as f:
+        f.write(_MAGIC)
+        for name in _ORDER:
+            f.write(tables[name].tobytes())
+    os.replace(temp_name, file_name)
+
+
+def read_tables(file_name=TABLES_FILE):
+    """
+    Reads the tables written by save_tables.
+
+    Returns:
+        dict: The tables, or None if the file is missing or invalid.
+    """
+    try:
+        with open(file_name, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None
+            tables = {}
+            for name in _ORDER:
+                table = array(_TYPECODES[name])
+                table.fromfile(f, NB_ROWS)
+                tables[name] = table
+            return tables
+    except (OSError, EOFError):
+        return None
+
+
+def load_tables(file_name=TABLES_FILE):
+    """
+    Loads the tables from the cache file, building and caching them if needed.
+
+    Returns:
+        dict: The tables as arrays (see build_tables).
+    """
+    tables = read_tables(file_name)
+    if tables is None:
+        tables = build_tables()
+        try:
+            save_tables(tables, file_name)
+        except OSError:
+            pass  # Dossier en lecture seule : les tables seront recalculées
+    return tables
@@ -0,0 +1,273 @@
+import os
+import numpy as np
+from engine.bitboard import DIRECTIONS, move
+
+# Enregistrement binaire des parties : un enregistrement de taille fixe par
+# position (plateau compacté, coup joué, case et valeur de la tuile apparue,
+# score), ajoutés à la fin d'un fichier, avec un index des parties.
+#
+#   games.traj        en-tête, puis RECORD_DTYPE par position
+#   games.traj.idx    en-tête, puis INDEX_DTYPE par partie (premier enregistrement, nombre)
+#   games.traj.stats  en-tête, puis STATS_DTYPE par position (facultatif)
+#
+# Une partie de n coups occupe n + 1 enregistrements : le dernier porte le
+# plateau final et le coup NO_MOVE. Les enregistrements sont écrits avant
+# l'entrée d'index : une partie interrompue n'est jamais indexée.
+# La lecture projette les fichiers en mémoire (numpy.memmap) et rend des vues,
+# sans rien décoder.
+
+RECORD_DTYPE = np.dtype([
+    ("board", "<u8"),  # Plateau avant le coup
+    ("move", "u1"),  # Indice dans DIRECTIONS, NO_MOVE pour la position finale
+    ("spawn_cell", "u1"),  # Case 4 * row + col de la tuile apparue après le coup, NO_SPAWN sinon
+    ("spawn_value", "u1"),  # Exposant de la tuile apparue (1 : un 2, 2 : un 4), 0 sinon
+    ("flags", "u1"),  # Réservé
+    ("score", "<u4"),  # Score avant le coup
+])
+INDEX_DTYPE = np.dtype([("start", "<u8"), ("count", "<u8")])
+STATS_DTYPE = np.dtype([
+    ("rollouts", "<u4"),  # Simulations de la décision (Monte Carlo), 0 sinon
+    ("values", "<f4", (len(DIRECTIONS),)),  # Valeur de chaque direction, NaN si non évaluée
+])
+
+NO_MOVE = 255
+NO_SPAWN = 255
+INDEX_SUFFIX = ".idx"
+STATS_SUFFIX = ".stats"
+BUFFER_GAMES = 64  # Parties gardées en mémoire avant écriture
+
+_HEADER_SIZE = 16  # Magic, taille d'un enregistrement, complété par des zéros
+_MAGICS = {"records": b"2048TRJ1", "index": b"2048IDX1", "stats": b"2048STA1"}
+
+
+def spawn_of(board, direction, new_board):
+    """
+    Retrouve la tuile apparue après un coup.
+
+    Args:
+        board (int): Le plateau avant le coup.
+        direction (str): La direction jouée.
+        new_board (int): Le plateau après le coup et l'apparition.
+
+    Returns:
+        tuple: La case (4 * row + col) et l'exposant de la tuile, (NO_SPAWN, 0) si aucune tuile n'est apparue.
+    """
+    difference = new_board ^ move(board, direction)[0]
+    if not difference:
+        return NO_SPAWN, 0
+    cell = (difference.bit_length() - 1) // 4
+    return cell, (new_board >> (4 * cell)) & 0xF
+
+
+class GameTrajectory:
+    """
+    Les positions d'une partie, accumulées en mémoire pendant qu'elle se joue,
+    puis converties en tableaux RECORD_DTYPE et STATS_DTYPE.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.stats_rows = []
+
+    def record(self, board, score, direction, new_board, rollouts=0, values=None):
+        """
+        Ajoute un coup.
+
+        Args:
+            board (int): Le plateau avant le coup.
+            score (int): Le score avant le coup.
+            direction (str): La direction jouée.
+            new_board (int): Le plateau après le coup et l'apparition.
+            rollouts (int): Simulations utilisées par la décision.
+            values (dict): Valeur de chaque direction évaluée (direction -> valeur).
+        """
+        cell, value = spawn_of(board, direction, new_board)
+        self.rows.append((board, DIRECTIONS.index(direction), cell, value, 0, score))
+        self.stats_rows.append((rollouts, [float("nan") if values is None else values.get(name, float("nan"))
+                                           for name in DIRECTIONS]))
+
+    def end(self, board, score):
+        """Ajoute la position finale."""
+        self.rows.append((board, NO_MOVE, NO_SPAWN, 0, 0, score))
+        self.stats_rows.append((0, [float("nan")] * len(DIRECTIONS)))
+
+    def records(self):
+        return np.array(self.rows, dtype=RECORD_DTYPE)
+
+    def stats(self):
+        return np.array(self.stats_rows, dtype=STATS_DTYPE)
+
+
+def _open_append(path, kind, itemsize):
+    """Ouvre un fichier en ajout, en écrivant son en-tête s'il est nouveau (ou vérifiant l'existant)."""
+    f = open(path, "ab")
+    if f.tell() == 0:
+        header = _MAGICS[kind] + np.uint32(itemsize).tobytes()
+        f.write(header.ljust(_HEADER_SIZE, b"\0"))
+    else:
+        _check_header(path, kind, itemsize)
+    return f
+
+
+def _check_header(path, kind, itemsize):
+    with open(path, "rb") as f:
+        header = f.read(_HEADER_SIZE)
+    if header[:8] != _MAGICS[kind] or int(np.frombuffer(header[8:12], dtype="<u4")[0]) != itemsize:
+        raise ValueError(f"{path} n'est pas un fichier de trajectoires compatible")
+
+
+def _whole_items(f, itemsize):
+    """Coupe un fichier ouvert en ajout après son dernier élément complet ; rend le nombre d'éléments."""
+    count, rest = divmod(f.tell() - _HEADER_SIZE, itemsize)
+    if rest:
+        f.truncate(_HEADER_SIZE + count * itemsize)
+    return count
+
+
+def empty_stats(count):
+    """
+    Returns:
+        numpy.ndarray: count statistiques vides (aucune simulation, valeurs NaN).
+    """
+    stats = np.zeros(count, dtype=STATS_DTYPE)
+    stats["values"] = np.nan
+    return stats
+
+
+class TrajectoryWriter:
+    """
+    Ajoute des parties à un fichier de trajectoires (et à son index).
+
+    Args:
+        path (str): Le fichier des enregistrements ; l'index et les statistiques
+            sont à côté (INDEX_SUFFIX, STATS_SUFFIX).
+        stats (bool): True pour écrire aussi les statistiques des décisions (toujours
+            écrites si le fichier en contient déjà, pour rester aligné).
+    """
+
+    def __init__(self, path, stats=False):
+        self.path = path
+        stats = stats or os.path.exists(path + STATS_SUFFIX)
+        self.records_file = _open_append(path, "records", RECORD_DTYPE.itemsize)
+        self.index_file = _open_append(path + INDEX_SUFFIX, "index", INDEX_DTYPE.itemsize)
+        self.stats_file = _open_append(path + STATS_SUFFIX, "stats", STATS_DTYPE.itemsize) if stats else None
+        # Après un arrêt en pleine écriture : fin partielle retirée, statistiques alignées
+        self.count = _whole_items(self.records_file, RECORD_DTYPE.itemsize)
+        _whole_items(self.index_file, INDEX_DTYPE.itemsize)
+        if self.stats_file is not None:
+            stats_count = _whole_items(self.stats_file, STATS_DTYPE.itemsize)
+            if stats_count > self.count:
+                self.stats_file.truncate(_HEADER_SIZE + self.count * STATS_DTYPE.itemsize)
+            elif stats_count < self.count:
+                self.stats_file.write(empty_stats(self.count - stats_count).tobytes())
+        self.pending = []
+
+    def write(self, trajectory):
+        """
+        Ajoute une partie terminée.
+
+        Args:
+            trajectory (GameTrajectory or tuple): La partie, ou ses tableaux (records, stats).
+        """
+        if isinstance(trajectory, GameTrajectory):
+            trajectory = (trajectory.records(), trajectory.stats())
+        self.pending.append(trajectory)
+        if len(self.pending) >= BUFFER_GAMES:
+            self.flush()
+
+    def flush(self):
+        """Écrit les parties en attente : enregistrements et statistiques d'abord, index ensuite."""
+        if not self.pending:
+            return
+        entries = np.zeros(len(self.pending), dtype=INDEX_DTYPE)
+        for number, (records, stats) in enumerate(self.pending):
+            entries[number] = (self.count, len(records))
+            self.count += len(records)
+            self.records_file.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+            if self.stats_file is not None:
+                if stats is None:
+                    stats = empty_stats(len(records))
+                self.stats_file.write(np.ascontiguousarray(stats, dtype=STATS_DTYPE).tobytes())
+        self.records_file.flush()
+        if self.stats_file is not None:
+            self.stats_file.flush()
+        self.index_file.write(entries.tobytes())
+        self.index_file.flush()
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        for f in (self.records_file, self.index_file, self.stats_file):
+            if f is not None:
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _map(path, kind, dtype):
+    """Projette un fichier en mémoire, sans l'en-tête (tableau vide si aucun élément)."""
+    _check_header(path, kind, dtype.itemsize)
+    count = (os.path.getsize(path) - _HEADER_SIZE) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=_HEADER_SIZE, shape=(count,))
+
+
+class TrajectoryReader:
+    """
+    Lecture d'un fichier de trajectoires projeté en mémoire.
+
+    records, index et stats sont des tableaux numpy sur les fichiers : game(i)
+    rend une vue sur les enregistrements de la i-ème partie, sans copie.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = _map(path, "records", RECORD_DTYPE)
+        self.index = _map(path + INDEX_SUFFIX, "index", INDEX_DTYPE)
+        stats_path = path + STATS_SUFFIX
+        self.stats = _map(stats_path, "stats", STATS_DTYPE) if os.path.exists(stats_path) else None
+
+    def __len__(self):
+        return len(self.index)
+
+    def _slice(self, game):
+        start, count = self.index[game]
+        return slice(int(start), int(start + count))
+
+    def game(self, game):
+        """
+        Returns:
+            numpy.ndarray: Les enregistrements (RECORD_DTYPE) de la partie : game(i)["board"]
+            est la suite de ses plateaux, game(i)["move"] celle de ses coups.
+        """
+        return self.records[self._slice(game)]
+
+    def game_stats(self, game):
+        """
+        Returns:
+            numpy.ndarray: Les statistiques (STATS_DTYPE) de chaque position de la partie,
+            None si le fichier n'en contient pas.
+        """
+        if self.stats is None:
+            return None
+        return self.stats[self._slice(game)]
+
+    def lengths(self):
+        """
+        Returns:
+            numpy.ndarray: Le nombre de coups de chaque partie.
+        """
+        return self.index["count"].astype(np.int64) - 1
+
+    def final_scores(self):
+        """
+        Returns:
+            numpy.ndarray: Le score final de chaque partie.
+        """
+        ends = self.index["start"] + self.index["count"] - 1
+        return self.records["score"][ends.astype(np.int64)]
@@ -0,0 +1,155 @@
+import sys
+from collections import OrderedDict
+import numpy as np
+
+# Table de transposition : mémorise la valeur des positions déjà évaluées,
+# clé = plateau compacté (ou tout entier dérivé du plateau), avec une taille
+# maximale fixe (en entrées et, au choix, en mémoire) et une politique de remplacement.
+
+DEFAULT_MAX_ENTRIES = 1 << 20
+ENTRY_OVERHEAD = 200  # Octets d'une entrée hors valeur : clé, tuple, place dans le dictionnaire (mesuré)
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def entry_bytes(value):
+    """
+    Returns:
+        int: La place occupée par une entrée de valeur value, en octets.
+    """
+    size = ENTRY_OVERHEAD + sys.getsizeof(value)
+    if isinstance(value, np.ndarray) and value.base is not None:
+        size += value.nbytes  # getsizeof ne compte pas les données d'une vue
+    return size
+
+
+class TranspositionTable:
+    """
+    Cache borné de positions : valeur, profondeur d'évaluation et nombre de visites.
+
+    Deux politiques de remplacement :
+    - "lru" : la table est pleine, on retire l'entrée la moins récemment utilisée ;
+    - "depth" : table à adressage direct (une case par hachage de clé), une entrée
+      n'est remplacée que par une évaluation au moins aussi profonde.
+
+    Avec max_megabytes, la place des entrées (entry_bytes) ne dépasse jamais ce
+    plafond : en "lru", les plus anciennes sont retirées ; en "depth", une
+    nouvelle entrée qui ne tient pas n'est pas mémorisée.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, policy="lru", max_megabytes=None):
+        if policy not in ("lru", "depth"):
+            raise ValueError(f"Politique de remplacement inconnue : {policy}")
+        self.max_entries = max_entries
+        self.max_bytes = None if max_megabytes is None else int(max_megabytes * 1024 * 1024)
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.clear()
+
+    def clear(self):
+        """Vide la table (les compteurs sont conservés)."""
+        self.bytes = 0
+        if self.policy == "lru":
+            self._entries = OrderedDict()
+        else:
+            self._slots = [None] * self.max_entries
+
+    def __len__(self):
+        if self.policy == "lru":
+            return len(self._entries)
+        return sum(slot is not None for slot in self._slots)
+
+    def _index(self, key):
+        # Hachage multiplicatif : les bits de poids faible du plateau varient peu
+        return (((key * _HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> 16) % self.max_entries
+
+    def get_entry(self, key, depth=0):
+        """
+        Cherche une position évaluée au moins à la profondeur demandée.
+
+        Args:
+            key (int): Le plateau compacté.
+            depth (int): La profondeur minimale acceptée.
+
+        Returns:
+            tuple: (value, depth, visits), ou None si la position est absente.
+        """
+        if self.policy == "lru":
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= depth:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        else:
+            slot = self._slots[self._index(key)]
+            if slot is not None and slot[0] == key and slot[2] >= depth:
+                self.hits += 1
+                return slot[1:]
+        self.misses += 1
+        return None
+
+    def get(self, key, depth=0):
+        """
+        Returns:
+            La valeur mémorisée pour key, ou None (voir get_entry).
+        """
+        entry = self.get_entry(key, depth)
+        return None if entry is None else entry[0]
+
+    def put(self, key, value, depth=0, visits=1):
+        """
+        Mémorise la valeur d'une position.
+
+        Args:
+            key (int): Le plateau compacté.
+            value: La valeur (nombre, tableau de sommes...).
+            depth (int): La profondeur à laquelle la valeur a été calculée.
+            visits (int): Le nombre de visites ou de simulations derrière la valeur.
+        """
+        size = entry_bytes(value)
+        if self.policy == "lru":
+            if key in self._entries:
+                self.bytes -= entry_bytes(self._entries.pop(key)[0])
+            elif len(self._entries) >= self.max_entries:
+                self._evict_oldest()
+            if self.max_bytes is not None:
+                if size > self.max_bytes:
+                    return
+                while self.bytes + size > self.max_bytes:
+                    self._evict_oldest()
+            self._entries[key] = (value, depth, visits)
+            self.bytes += size
+            return
+
+        index = self._index(key)
+        slot = self._slots[index]
+        old_size = 0 if slot is None else entry_bytes(slot[1])
+        if slot is not None and slot[0] != key and slot[2] > depth:
+            return  # On garde l'évaluation la plus profonde
+        if self.max_bytes is not None and self.bytes - old_size + size > self.max_bytes:
+            return  # Plafond de mémoire atteint
+        if slot is not None and slot[0] != key:
+            self.evictions += 1
+        self._slots[index] = (key, value, depth, visits)
+        self.bytes += size - old_size
+
+    def _evict_oldest(self):
+        _, (value, _, _) = self._entries.popitem(last=False)
+        self.bytes -= entry_bytes(value)
+        self.evictions += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: Les compteurs de la table (hits, misses, evictions, entries, bytes, hit_rate).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "bytes": self.bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,162 @@
+from engine.bitboard import FOUR_PROBABILITY, ROW_MASK, empty_cells, legal_moves, transpose
+from engine.instrumentation import STATS
+from engine.symmetry import canonical_board
+
+DEPTH = 2  # Nombre de coups de l'IA explorés (nœuds max)
+MIN_PROBABILITY = 0.0001  # Les branches moins probables sont évaluées directement
+
+# Poids de l'heuristique, évaluée ligne par ligne puis colonne par colonne
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+
+def _row_heuristic(row):
+    """
+    Évalue une ligne de 16 bits : cases vides, fusions possibles, monotonie et somme des tuiles.
+    """
+    line = [(row >> (4 * i)) & 0xF for i in range(4)]
+    total = sum(exponent ** SUM_POWER for exponent in line)
+    empty = line.count(0)
+
+    merges = 0
+    previous = 0
+    counter = 0
+    for exponent in line:
+        if not exponent:
+            continue
+        if exponent == previous:
+            counter += 1
+        elif counter > 0:
+            merges += 1 + counter
+            counter = 0
+        previous = exponent
+    if counter > 0:
+        merges += 1 + counter
+
+    monotonicity_left = 0.0
+    monotonicity_right = 0.0
+    for i in range(1, 4):
+        if line[i - 1] > line[i]:
+            monotonicity_left += line[i - 1] ** MONOTONICITY_POWER - line[i] ** MONOTONICITY_POWER
+        else:
+            monotonicity_right += line[i] ** MONOTONICITY_POWER - line[i - 1] ** MONOTONICITY_POWER
+
+    return (LOST_PENALTY + EMPTY_WEIGHT * empty + MERGES_WEIGHT * merges
+            - MONOTONICITY_WEIGHT * min(monotonicity_left, monotonicity_right)
+            - SUM_WEIGHT * total)
+
+
+class _Cancelled(Exception):
+    """Levée dans la recherche quand l'arrêt est demandé."""
+
+
+HEURISTIC_TABLE = [_row_heuristic(row) for row in range(1 << 16)]
+
+
+def heuristic(board):
+    """
+    Args:
+        board (int): Le plateau.
+
+    Returns:
+        float: La valeur heuristique du plateau (somme sur les lignes et les colonnes).
+    """
+    transposed = transpose(board)
+    return (HEURISTIC_TABLE[board & ROW_MASK] + HEURISTIC_TABLE[(board >> 16) & ROW_MASK]
+            + HEURISTIC_TABLE[(board >> 32) & ROW_MASK] + HEURISTIC_TABLE[board >> 48]
+            + HEURISTIC_TABLE[transposed & ROW_MASK] + HEURISTIC_TABLE[(transposed >> 16) & ROW_MASK]
+            + HEURISTIC_TABLE[(transposed >> 32) & ROW_MASK] + HEURISTIC_TABLE[transposed >> 48])
+
+
+def _max_node(board, depth, probability, evaluate, table, rewards, stop):
+    """Valeur du meilleur coup (0 si aucun coup ne change le plateau : partie perdue)."""
+    best = 0.0
+    for _, new_board, gain in legal_moves(board):
+        value = _chance_node(new_board, depth - 1, probability, evaluate, table, rewards, stop)
+        best = max(best, value + gain if rewards else value)
+    return best
+
+
+def _chance_node(board, depth, probability, evaluate, table, rewards, stop):
+    """Espérance sur toutes les apparitions possibles d'un 2 ou d'un 4 dans une case vide."""
+    if depth <= 0 or probability < MIN_PROBABILITY:
+        return evaluate(board)
+    # Test de l'arrêt aux seuls nœuds internes : les feuilles restent sans surcoût
+    if stop is not None and stop.is_set():
+        raise _Cancelled
+
+    if table is not None:
+        # Les 8 symétries d'un plateau ont la même valeur : une seule entrée pour toutes
+        key = canonical_board(board)
+        value = table.get(key, depth)
+        if value is not None:
+            return value
+
+    cells = empty_cells(board)
+    if not cells:
+        return evaluate(board)
+    cell_probability = probability / len(cells)
+    total = 0.0
+    for index in cells:
+        shift = 4 * index
+        total += (1 - FOUR_PROBABILITY) * _max_node(
+            board | (1 << shift), depth, cell_probability * (1 - FOUR_PROBABILITY), evaluate, table, rewards, stop)
+        total += FOUR_PROBABILITY * _max_node(
+            board | (2 << shift), depth, cell_probability * FOUR_PROBABILITY, evaluate, table, rewards, stop)
+    value = total / len(cells)
+
+    if table is not None:
+        table.put(key, value, depth)
+    return value
+
+
+def expectimax(board, depth=DEPTH, evaluate=heuristic, table=None, rewards=False, stop=None):
+    """
+    Choisit le coup qui maximise l'espérance de l'évaluation après depth coups.
+
+    Les nœuds max sont les quatre coups de l'IA, les nœuds de chance les
+    apparitions d'un 2 ou d'un 4 dans chaque case vide. Les feuilles sont
+    notées par evaluate.
+
+    Args:
+        board (int): Le plateau.
+        depth (int): Nombre de coups de l'IA explorés.
+        evaluate (callable): Fonction d'évaluation des feuilles (plateau -> valeur).
+        table (TranspositionTable): Cache des nœuds de chance déjà évalués, à garder
+            d'un coup à l'autre ; None pour ne rien mémoriser.
+        rewards (bool): True pour ajouter les points gagnés par chaque coup à
+            l'évaluation des feuilles, quand evaluate estime le score encore à
+            gagner (réseau de n-uplets : evaluate=network.evaluate).
+        stop (threading.Event): Arrêt demandé de l'extérieur (échéance, fenêtre
+            fermée) : la recherche s'interrompt et ne garde que les directions
+            déjà évaluées entièrement (la première direction jouable si aucune).
+
+    Returns:
+        tuple: La meilleure direction (None si aucun coup n'est possible) et la
+        valeur de chaque direction jouable.
+    """
+    with STATS.scope("decision"):
+        if table is not None:
+            hits, misses = table.hits, table.misses
+        values = {}
+        moves = legal_moves(board)
+        try:
+            for direction, new_board, gain in moves:
+                values[direction] = _chance_node(new_board, depth - 1, 1.0, evaluate, table, rewards, stop)
+                if rewards:
+                    values[direction] += gain
+        except _Cancelled:
+            pass
+        if table is not None:
+            # Compteurs de la table plutôt qu'une mesure par nœud : rien à payer quand c'est désactivé
+            STATS.count("cache_hits", table.hits - hits)
+            STATS.count("cache_misses", table.misses - misses)
+    if not values:
+        # Aucune direction évaluée avant l'arrêt : le premier coup jouable plutôt que rien
+        return (moves[0][0] if moves else None), values
+    return max(values, key=values.get), values
@@ -0,0 +1,99 @@
+import random
+import time
+from engine.bitboard import Game_value, apply_move, new_board
+from engine import instrumentation, journal
+from engine.journal import GameLog
+from engine.transposition import TranspositionTable
+from expectimax.expectimax import DEPTH, expectimax
+
+TABLE_SIZE = 1 << 18  # Nombre maximal de positions mémorisées pendant une partie
+TABLE_MEGABYTES = 64  # Mémoire maximale de la table de transposition
+DEADLINE = 2.0  # En mode spectateur, la recherche est arrêtée après ce délai (en secondes)
+
+
+def game(game_value, depth=DEPTH, network=None, seed=None):
+    """
+    Plays a full game without display, the expectimax agent choosing every move.
+
+    Args:
+        game_value (Game_value): The object containing game-related information.
+        depth (int): Number of moves explored by the search.
+        network (NTupleNetwork): Optional n-tuple network used as leaf evaluator
+            instead of the hand-written heuristic.
+        seed (int): Seed of the game spawns, None for a new random game.
+
+    Returns:
+        str: The game state ("lost").
+    """
+    game_value.score = 0
+
+    # Les positions évaluées à un coup resservent au coup suivant
+    table = TranspositionTable(TABLE_SIZE, max_megabytes=TABLE_MEGABYTES)
+    rng = random.Random(seed)
+    game_value.board = new_board(rng)
+    log = GameLog("expectimax", depth=depth, seed=seed)
+
+    while True:
+        start = time.perf_counter()
+        if network is None:
+            direction = expectimax(game_value.board, depth, table=table)[0]
+        else:
+            direction = expectimax(game_value.board, depth, network.evaluate, table, rewards=True)[0]
+        decision_seconds = time.perf_counter() - start
+        if direction is None:
+            log.end(game_value)
+            return "lost"
+        reponse = apply_move(game_value, direction, rng)
+        log.move(game_value, direction, decision_seconds)
+        if reponse == "lost":
+            log.end(game_value)
+            return "lost"
+
+
+def spectate_game(window, game_value, depth=DEPTH, seed=None, deadline=DEADLINE):
+    """
+    Watches the agent play at full speed: the decisions run in a background
+    thread and the window shows the latest position (see spectator.spectate).
+
+    Args:
+        window (pygame.Surface): The game window.
+        game_value (Game_value): The object containing game-related information.
+        depth (int): Number of moves explored by the search.
+        seed (int): Seed of the game spawns, None for a new random game.
+        deadline (float): Maximum duration of a search, in seconds; a stopped
+            search plays the best direction fully evaluated.
+
+    Returns:
+        str: The game state ("lost", or "quit" if the window was closed before the end).
+    """
+    from spectator import spectate
+
+    game_value.score = 0
+    rng = random.Random(seed)
+    game_value.board = new_board(rng)
+    table = TranspositionTable(TABLE_SIZE, max_megabytes=TABLE_MEGABYTES)
+
+    def decide(current, stop):
+        return expectimax(current.board, depth, table=table, stop=stop)[0]
+
+    return spectate(window, game_value, decide, "expectimax", rng, deadline=deadline)
+
+
+def start_game(game_value):
+    """
+    Starts the game by initializing the game window and running the main loop.
+
+    Returns:
+        str: The result of the game function.
+    """
+    from interface import get_window
+
+    return spectate_game(get_window(), game_value)
+
+
+if __name__ == "__main__":
+    # Partie sans affichage : python -m expectimax.gameIAExpectimax [--stats table] [--profile]
+    # [--log-file] [--trace-moves]
+    instrumentation.configure()
+    journal.configure()
+    game(Game_value())
@@ -0,0 +1,76 @@
+import os
+import random
+import numpy as np
+from engine.bitboard import DIRECTIONS, max_tile, new_board, play_move
+from engine.pool import session_pool
+
+NB_WORKERS = os.cpu_count() or 1
+NB_SEEDS = 8  # Nombre de parties (une graine chacune) jouées par individu
+
+
+def play_sequence(individu, rng):
+    """
+    Joue la séquence de mouvements d'un individu sans affichage.
+
+    Args:
+        individu (numpy.ndarray): La séquence de gènes (indices dans DIRECTIONS).
+        rng (random.Random): Générateur aléatoire des apparitions de tuiles.
+
+    Returns:
+        tuple: Le score atteint à la fin de la séquence ou de la partie, le nombre
+        de coups joués et la plus grande tuile.
+    """
+    board = new_board(rng)
+    score = 0
+    moves = 0
+    for gene in individu:
+        board, gain, lost = play_move(board, DIRECTIONS[gene], rng)
+        score += gain
+        moves += 1
+        if lost:
+            break
+    return score, moves, max_tile(board)
+
+
+def fitness_job(job):
+    """
+    Évalue un bloc d'individus, chacun sur une partie par graine.
+
+    Args:
+        job (tuple): (block, seeds), block étant une matrice (individus, gènes).
+
+    Returns:
+        tuple: Pour chaque individu du bloc, la moyenne et la variance des scores, la
+        plus grande tuile atteinte et le nombre moyen de coups joués.
+    """
+    block, seeds = job
+    games = np.array([[play_sequence(individu, random.Random(seed)) for seed in seeds] for individu in block],
+                     dtype=np.float64).reshape(len(block), len(seeds), 3)
+    scores = games[:, :, 0]
+    return scores.mean(axis=1), scores.var(axis=1), games[:, :, 2].max(axis=1), games[:, :, 1].mean(axis=1)
+
+
+def evaluate_population(population, seeds, workers=NB_WORKERS):
+    """
+    Évalue toute la population, chaque individu sur les mêmes graines.
+
+    Les individus sont répartis entre les processus ; les résultats sont
+    rendus dans l'ordre de la population.
+
+    Args:
+        population (numpy.ndarray): La matrice (individus, gènes) de la population.
+        seeds (list): Les graines des parties jouées par chaque individu.
+        workers (int): Nombre de processus, None ou 1 pour tout jouer dans le processus courant.
+
+    Returns:
+        tuple: Quatre tableaux numpy, pour chaque individu : moyenne et variance des
+        scores, plus grande tuile atteinte et nombre moyen de coups joués.
+    """
+    seeds = [int(seed) for seed in seeds]
+    if workers and workers > 1:
+        # Quelques blocs par processus : les plus rapides reprennent le travail des autres
+        blocks = np.array_split(population, min(len(population), 4 * workers))
+        results = session_pool("fitness", workers).map(fitness_job, [(block, seeds) for block in blocks])
+    else:
+        results = [fitness_job((population, seeds))]
+    return tuple(np.concatenate(column) for column in zip(*results))
@@ -1,476 +1,196 @@
-import pygame
 import random
-import math
-from genetiques.model import generate_population, generate_random_individual
-from genetiques.sauvegarde import load_pop, save_pop
-
-pygame.init()
+import numpy as np
+from engine.bitboard import Game_value, apply_move, new_board
+from engine import instrumentation, journal
+from engine.instrumentation import STATS
+from engine.journal import GameLog, log_event
+from genetiques.evaluation import NB_SEEDS, NB_WORKERS, evaluate_population
+from genetiques.model import MOVES, generate_population
+from genetiques.sauvegarde import CHECKPOINT_DIR, KEEP, STATS_COLUMNS, load_pop, save_pop
 
 FPS = 200
+ANIMATION_DURATION = 50  # En millisecondes
 
-WIDTH, HEIGHT = 800, 800
-ROWS = 4
-COLS = 4
-
-RECT_HEIGHT = HEIGHT // ROWS
-RECT_WIDTH = WIDTH // COLS
-
-score = 0
-
-OUTLINE_COLOR = (187, 173, 160)
-OUTLINE_THICKNESS = 10
-BACKROUND_COLOR = (205, 192, 180)
-FONT_COLOR = (199, 110, 101)
-
-FONT = pygame.font.SysFont("comicsans", 60, bold=True)
-SCORE_FONT = pygame.font.SysFont("comicsans", 40, bold=True)
-MOVE_VEL = 20
-
-WINDOW = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("2048")
-
-class Game_value : 
-    def __init__(self):
-        self.score = 0
-        self.tabOfInfo = []
-        # [(value,row,col),(value,row,col)]
-
-class Tile:
-    COLORS = [
-        (237, 229, 218),
-        (238, 225, 201),
-        (243, 178, 122),
-        (246, 150, 101),
-        (247, 124, 95),
-        (247, 95, 59),
-        (237, 208, 115),
-        (237, 204, 99),
-        (236, 202, 80),
-    ]
-
-
-    def __init__(self, value, row, col):
-        self.value = value
-        self.row = row
-        self.col = col
-        self.x = col * RECT_WIDTH
-        self.y = row * RECT_HEIGHT
-        
-    def get_info(self) :
-        return self.value,self.row,self.col
-    
-    
-    def get_color(self):
-        """
-        Returns:
-        tuple: The RGB color of the tile based on its value.
-        """
-        color_index = int(math.log2(self.value)) - 1
-        color = self.COLORS[color_index]
-        return color
-
-    def draw(self, window):
-        """
-        Draws the tile on the game window with its value and color.
-
-        Args:
-            window (pygame.Surface): The game window where the tile is drawn.
-        """
-        color = self.get_color()
-        pygame.draw.rect(window, color, (self.x, self.y, RECT_WIDTH, RECT_HEIGHT))
-
-        text = FONT.render(str(self.value), 1, FONT_COLOR)
-        window.blit(
-            text,
-            (
-                self.x + (RECT_WIDTH / 2 - text.get_width() / 2),
-                self.y + (RECT_HEIGHT / 2 - text.get_height() / 2),
-            ),
-        )
-
-    def set_pos(self, ceil=False):
-        """
-        Updates the tile's row and column position based on its current x and y coordinates.
-
-        Args:
-            ceil (bool): If True, uses the ceiling function; otherwise, uses the floor function.
-        """
-        if ceil:
-            self.row = math.ceil(self.y / RECT_HEIGHT)
-            self.col = math.ceil(self.x / RECT_WIDTH)
-        else:
-            self.row = math.floor(self.y / RECT_HEIGHT)
-            self.col = math.floor(self.x / RECT_WIDTH)
-
-    def move(self, delta):
-        """
-        Moves the tile by a given delta in x and y directions.
-
-        Args:
-            delta (tuple): A tuple of two integers representing the change in x and y positions.
-        """
-        self.x += delta[0]
-        self.y += delta[1]
-
-
-def draw_grid(window):
-    """
-    Draws the grid lines and border of the game window.
-
-    Args:
-        window (pygame.Surface): The game window where the grid is drawn.
-    """
-    for row in range(1, ROWS):
-        y = row * RECT_HEIGHT
-        pygame.draw.line(window, OUTLINE_COLOR, (0, y), (WIDTH, y), OUTLINE_THICKNESS)
-
-    for col in range(1, COLS):
-        x = col * RECT_WIDTH
-        pygame.draw.line(window, OUTLINE_COLOR, (x, 0), (x, HEIGHT), OUTLINE_THICKNESS)
-
-    pygame.draw.rect(window, OUTLINE_COLOR, (0, 0, WIDTH, HEIGHT), OUTLINE_THICKNESS)
-
-
-def draw(window, tiles, game_value):
-    """
-    Draws the entire game, including the background, grid, tiles, and score.
-
-    Args:
-        window (pygame.Surface): The game window.
-        tiles (dict): A dictionary of all tiles on the board.
-    """
-    window.fill(BACKROUND_COLOR)
-
-    # Affichage des tuiles
-    for tile in tiles.values():
-        tile.draw(window)
-
-    draw_grid(window)
-
-    # Affichage du score par-dessus les autres éléments
-    score_text = SCORE_FONT.render(f"Score: {game_value.score}", 1, (0, 0, 0))
-    window.blit(score_text, (WIDTH // 2 - score_text.get_width() // 2, 20))
-
-    pygame.display.update()
-
-
-def get_random_pos(tiles):
-    """
-    Generates a random position on the board that is not already occupied.
-
-    Args:
-        tiles (dict): A dictionary of all tiles on the board.
-
-    Returns:
-        tuple: A tuple (row, col) representing the random position.
-    """
-    row = None
-    col = None
-    while True:
-        row = random.randrange(0, ROWS)
-        col = random.randrange(0, COLS)
-
-        if f"{row}{col}" not in tiles:
-            break
-
-    return row, col
-
-
-def move_tiles(window, tiles, clock, direction, game_value):
-    """
-    Handles the movement and merging of tiles in the specified direction.
-
-    Args:
-        window (pygame.Surface): The game window.
-        tiles (dict): A dictionary of all tiles on the board.
-        clock (pygame.time.Clock): The game clock to control the frame rate.
-        direction (str): The direction of movement ("left", "right", "up", "down").
-        game_value (Game_value): The object containing game-related information.
-
-    Returns:
-        str: "continue" if the game continues, or "lost" if the game is over.
-    """
-    updated = True
-    blocks = set()
-
-    # Détermine les paramètres en fonction de la direction
-    if direction == "left":
-        sort_func = lambda x: x.col
-        reverse = False
-        delta = (-MOVE_VEL, 0)
-        boundary_check = lambda tile: tile.col == 0
-        get_next_tile = lambda tile: tiles.get(f"{tile.row}{tile.col-1}")
-        merge_check = lambda tile, next_tile: tile.x > next_tile.x + MOVE_VEL
-        move_check = lambda tile, next_tile: tile.x > next_tile.x + RECT_WIDTH + MOVE_VEL
-        ceil = True
-    elif direction == "right":
-        sort_func = lambda x: x.col
-        reverse = True
-        delta = (MOVE_VEL, 0)
-        boundary_check = lambda tile: tile.col == COLS - 1
-        get_next_tile = lambda tile: tiles.get(f"{tile.row}{tile.col+1}")
-        merge_check = lambda tile, next_tile: tile.x < next_tile.x - MOVE_VEL
-        move_check = lambda tile, next_tile: tile.x + RECT_WIDTH + MOVE_VEL < next_tile.x
-        ceil = False
-    elif direction == "up":
-        sort_func = lambda x: x.row
-        reverse = False
-        delta = (0, -MOVE_VEL)
-        boundary_check = lambda tile: tile.row == 0
-        get_next_tile = lambda tile: tiles.get(f"{tile.row-1}{tile.col}")
-        merge_check = lambda tile, next_tile: tile.y > next_tile.y + MOVE_VEL
-        move_check = lambda tile, next_tile: tile.y > next_tile.y + RECT_WIDTH + MOVE_VEL
-        ceil = True
-    elif direction == "down":
-        sort_func = lambda x: x.row
-        reverse = True
-        delta = (0, MOVE_VEL)
-        boundary_check = lambda tile: tile.row == ROWS - 1
-        get_next_tile = lambda tile: tiles.get(f"{tile.row+1}{tile.col}")
-        merge_check = lambda tile, next_tile: tile.y < next_tile.y - MOVE_VEL
-        move_check = lambda tile, next_tile: tile.y + RECT_WIDTH + MOVE_VEL < next_tile.y
-        ceil = False
-
-    while updated:
-        clock.tick(FPS)
-        updated = False
-        sorted_tiles = sorted(tiles.values(), key=sort_func, reverse=reverse)
-
-        for i, tile in enumerate(sorted_tiles):
-            if boundary_check(tile):
-                continue
-
-            next_tile = get_next_tile(tile)
-            if not next_tile:
-                tile.move(delta)
-            elif tile.value == next_tile.value and tile not in blocks and next_tile not in blocks:
-                if merge_check(tile, next_tile):
-                    tile.move(delta)
-                else:
-                    game_value.score += next_tile.value
-                    next_tile.value *= 2
-                    if next_tile.value==2048 : 
-                        return "lost"
-                    sorted_tiles.pop(i)
-                    blocks.add(next_tile)
-            elif move_check(tile, next_tile):
-                tile.move(delta)
-            else:
-                continue
-            tile.set_pos(ceil)
-            updated = True
-
-        update_tiles(window, tiles, sorted_tiles, game_value)
-
-    # Passe game_value pour inclure les nouvelles tuiles dans tabOfInfo
-    reponse = end_move(tiles, game_value)
-    if reponse == "lost":
-        return "lost"
-
-    return "continue"
-
-def end_move(tiles, game_value):
-    """
-    Checks if the game should continue or end after a move and generates a new tile if possible.
-
-    Args:
-        tiles (dict): A dictionary of all tiles on the board.
-        game_value (Game_value): The object containing game-related information.
-
-    Returns:
-        str: "continue" if the game continues, or "lost" if no moves are possible.
-    """
-    if len(tiles) == 16:  # Vérifie si la grille est pleine
-        for tile in tiles.values():
-            for delta_row, delta_col in [(0, 1), (1, 0)]:
-                neighbor = tiles.get(f"{tile.row + delta_row}{tile.col + delta_col}")
-                if neighbor and neighbor.value == tile.value:
-                    return "continue"
-
-        return "lost"
-
-    # Génère une nouvelle tuile
-    row, col = get_random_pos(tiles)
-    tiles[f"{row}{col}"] = Tile(random.choice([2, 4]), row, col)
-
-    # Met à jour tabOfInfo immédiatement après la génération de la nouvelle tuile
-    game_value.tabOfInfo = [tile.get_info() for tile in tiles.values()]
-    return "continue"
-
-
-def update_tiles(window, tiles, sorted_tiles,game_value):
-    """
-    Updates the tiles dictionary with the current positions and redraws the game.
-
-    Args:
-        window (pygame.Surface): The game window.
-        tiles (dict): A dictionary of all tiles on the board.
-        sorted_tiles (list): A list of tiles sorted for the current move.
-    """
-
-    updated_tiles = {}
-
-    game_value.tabOfInfo = []  
-    for tile in sorted_tiles:
-        updated_tiles[f"{tile.row}{tile.col}"] = tile
-        game_value.tabOfInfo.append(tile.get_info())
-
-    tiles.clear()
-    tiles.update(updated_tiles)
-
-    draw(window, tiles,game_value)
-
-
-def generate_titles():
-    """
-    Generates the initial tiles on the board at the start of the game.
-
-    Returns:
-        dict: A dictionary of the initial tiles.
-    """
-    tiles = {}
-    for _ in range(2):
-        row, col = get_random_pos(tiles)
-        tiles[f"{row}{col}"] = Tile(2, row, col)
-
-    return tiles
 
+def play_individu(individu, game_value, window=None, rng=random):
+    '''
+    L'IA fait bouger les blocs de façon aléatoire au début (sans affichage si window vaut None).
 
-def game(window,game_value):
-    """
-    Runs the main game loop, handling user input and game logic.
-
-    Args:
-        The game window.
-
-    Returns:
-        tuple: A tuple containing the game state ("lost").
-    """
-    reponse = ""
+    Rend le score final, ou None si la fenêtre a été fermée pendant la partie.
+    '''
     game_value.score = 0
-
-    clock = pygame.time.Clock()
-    run = True
-
-    tiles = generate_titles()
-
-    while run:
-        clock.tick(FPS)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-                return "lost", 0
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
-                    reponse = move_tiles(window, tiles, clock, "left",game_value)
-                if event.key == pygame.K_RIGHT:
-                    reponse = move_tiles(window, tiles, clock, "right",game_value)
-                if event.key == pygame.K_UP:
-                    reponse = move_tiles(window, tiles, clock, "up",game_value)
-                if event.key == pygame.K_DOWN:
-                    reponse = move_tiles(window, tiles, clock, "down",game_value)
-                if reponse == "lost":
-
-                    return "lost"
-        draw(window, tiles,game_value)
-        
-
-    pygame.quit()
-    
-    
-def play_individu(individu, game_value, window):
-    '''L'IA fait bouger les blocs de façon aléatoire au début'''
-    game_value.score = 0
-    clock = pygame.time.Clock()
-    tiles = generate_titles()
+    if window is not None:
+        # Import local : l'entraînement sans fenêtre ne charge ni pygame ni les polices
+        import pygame
+        from interface import move_tiles
+        clock = pygame.time.Clock()
+    game_value.board = new_board(rng)
+    log = GameLog("genetique")
     i = 0  
     while i < len(individu):  # Continue jusqu'à ce que tous les mouvements soient joués
-        move = individu[i]
-        print(f"Move: {move}, Score: {game_value.score}")
+        direction = MOVES[individu[i]]
 
-        if move == "left":
-            reponse = move_tiles(window, tiles, clock, "left", game_value)
-        elif move == "right":
-            reponse = move_tiles(window, tiles, clock, "right", game_value)
-        elif move == "up":
-            reponse = move_tiles(window, tiles, clock, "up", game_value)
-        elif move == "down":
-            reponse = move_tiles(window, tiles, clock, "down", game_value)
-
-        draw(window, tiles, game_value)
+        if window is None:
+            reponse = apply_move(game_value, direction, rng)
+        else:
+            # La fenêtre reste réactive : la fermer arrête la partie rejouée
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                log.end(game_value)
+                return None
+            reponse = move_tiles(window, clock, direction, game_value, FPS, ANIMATION_DURATION, rng)
+        log.move(game_value, direction)
 
         if reponse == "lost":
-            print(f"Lost at move: {move}, Final Score: {game_value.score}")
-            return game_value.score  # Retourner le score final si le jeu est perdu
+            break  # Le score final est celui de la partie perdue
 
         i += 1  
 
-    return game_value.score  # Retourner le score final sauf si perdu
+    log.end(game_value)
+    return game_value.score  # Retourner le score final
 
 
-def eval_pop(population, game_value, window):
-    scores = []
-    for individu in population:
-        score = play_individu(individu, game_value,window)
-        scores.append(score)
-    return scores
+def eval_pop(population, seeds, workers=NB_WORKERS):
+    """
+    Score de chaque individu : moyenne et variance sur une partie par graine, avec
+    la plus grande tuile atteinte et le nombre moyen de coups joués.
 
+    Les parties sont jouées sans affichage, réparties entre workers processus ;
+    les résultats sont dans l'ordre de la population.
+    """
+    return evaluate_population(population, seeds, workers)
 
-def selection(population, scores, num_parents):
-    """meilleurs individus selon leurs scores."""
-    sorted_population = [individu for _, individu in sorted(zip(scores, population), reverse=True)]
-    return sorted_population[:num_parents]
 
-def crossover(parents, population_size):
-    """nouvelle génération en combinant deux parents."""
-    new_population = []
-    while len(new_population) < population_size:
-        parent1 = random.choice(parents)
-        parent2 = random.choice(parents)
-        crossover_point = random.randint(0, len(parent1) - 1)
-        child = parent1[:crossover_point] + parent2[crossover_point:]
-        new_population.append(child)
-    return new_population
+def selection(population, scores, num_parents, tournament_size=None, rng=None):
+    """
+    Choisit num_parents parents.
 
+    Sans tournoi, ce sont les meilleurs individus (argpartition, sans trier toute
+    la population) ; avec tournament_size, chaque parent est le meilleur de
+    tournament_size individus tirés au hasard.
 
-def mutate(population, mutation_rate):
-    """ Un truc en plus aléatoire"""
-    for i in range(len(population)):
-        if random.random() < mutation_rate:
-            mutation_point = random.randint(0, len(population[i]) - 1)
-            population[i][mutation_point] = random.choice(["up", "down", "left", "right"])
+    Returns:
+        numpy.ndarray: La matrice des parents, du meilleur score au moins bon.
+    """
+    scores = np.asarray(scores)
+    if tournament_size:
+        if rng is None:
+            rng = np.random.default_rng()
+        entrants = rng.integers(0, len(population), (num_parents, tournament_size))
+        chosen = entrants[np.arange(num_parents), scores[entrants].argmax(axis=1)]
+    else:
+        chosen = np.argpartition(-scores, num_parents - 1)[:num_parents]
+    chosen = chosen[np.argsort(-scores[chosen], kind="stable")]
+    return population[chosen]
+
+def crossover(parents, population_size, rng=None):
+    """nouvelle génération en combinant deux parents (un point de croisement par enfant)."""
+    if rng is None:
+        rng = np.random.default_rng()
+    genome_length = parents.shape[1]
+    parent1 = rng.integers(0, len(parents), population_size)
+    parent2 = rng.integers(0, len(parents), population_size)
+    crossover_points = rng.integers(0, genome_length, population_size)
+    # Les gènes avant le point viennent du premier parent, les autres du second
+    from_first = np.arange(genome_length) < crossover_points[:, None]
+    return np.where(from_first, parents[parent1], parents[parent2])
+
+
+def mutate(population, mutation_rate, rng=None):
+    """ Un truc en plus aléatoire : un gène remplacé chez chaque individu muté (sur place)"""
+    if rng is None:
+        rng = np.random.default_rng()
+    size, genome_length = population.shape
+    mutants = np.flatnonzero(rng.random(size) < mutation_rate)
+    mutation_points = rng.integers(0, genome_length, len(mutants))
+    population[mutants, mutation_points] = rng.integers(0, len(MOVES), len(mutants), dtype=population.dtype)
     return population
 
 
-def algorithme_genetique(game_value, window, generations=50, population_size=100, mutation_rate=0.1, num_parents=10, resume_from_saved=True):
-    """Algorithme génétique pour entraîner l'IA."""
-    
-    if resume_from_saved:
-        population, starting_generation = load_pop("pop.json")
-        if not population:
-            population = generate_population(population_size)  
-        generation = starting_generation
+def algorithme_genetique(game_value, window=None, generations=50, population_size=100, mutation_rate=0.1, num_parents=10, resume_from_saved=True,
+                         nb_seeds=NB_SEEDS, workers=None, seed=None, fixed_seeds=False, elitism=0,
+                         tournament_size=None, checkpoint_dir=CHECKPOINT_DIR, keep=KEEP):
+    """
+    Algorithme génétique pour entraîner l'IA.
+
+    Chaque individu est évalué sans affichage sur nb_seeds parties (les mêmes
+    graines pour toute la génération), en parallèle sur workers processus. Par
+    défaut (workers None), NB_WORKERS processus sans fenêtre ; avec une fenêtre,
+    l'évaluation reste dans le processus courant, pygame déjà initialisé ne
+    devant pas être copié dans des processus.
+    Avec une fenêtre, le meilleur individu de chaque génération est rejoué à l'écran ;
+    fermer la fenêtre arrête l'entraînement à la fin de la génération en cours
+    (son point de reprise est écrit).
+
+    seed rend l'entraînement reproductible (population, graines, croisements et
+    mutations) ; avec fixed_seeds, toutes les générations sont évaluées sur les
+    mêmes graines, leurs scores sont alors directement comparables.
+
+    La population est une matrice (population_size, gènes) de uint8. Les elitism
+    meilleurs individus passent tels quels à la génération suivante ;
+    tournament_size choisit la sélection par tournois plutôt que les meilleurs.
+
+    Après chaque génération, un point de reprise est écrit dans checkpoint_dir
+    (les keep derniers sont gardés) ; resume_from_saved repart du plus récent,
+    avec l'état du générateur aléatoire.
+    """
+    if workers is None:
+        workers = NB_WORKERS if window is None else 1
+    rng = np.random.default_rng(seed)
+    state = load_pop(checkpoint_dir) if resume_from_saved else None
+
+    if state is not None:
+        population = state["population"]
+        generation = state["generation"]
+        rng.bit_generator.state = state["rng_state"]
+        best_ever, best_ever_score = state["best"], state["best_score"]
+        stats = state["stats"]
+        seeds = state["seeds"]
     else:
-        population = generate_population(population_size)
+        population = generate_population(population_size, rng=rng)
         generation = 0
+        best_ever, best_ever_score = None, -np.inf
+        stats = np.zeros((0, len(STATS_COLUMNS)))
+        seeds = None
 
     for generation in range(generation, generations):
-        print(f"=== Génération {generation + 1} ===")
-        
-        scores = eval_pop(population, game_value, window)
-        print(f"Meilleur score de cette génération : {max(scores)}")
-        
-        # Sélection des meilleurs individus 
-        parents = selection(population, scores, num_parents)
-        
-        # Croisement 
-        population = crossover(parents, population_size)
-        
-        # mutation
-        population = mutate(population, mutation_rate)
-
-        # Sauvegarde de la population 
-        save_pop(population, generation + 1)
+        with STATS.scope("generation"):
+            # Graines des parties de la génération, les mêmes pour tous les individus
+            if seeds is None or not fixed_seeds:
+                seeds = rng.integers(2**63, size=nb_seeds).tolist()
+            with STATS.phase("evaluate"):
+                scores, variances, max_tiles, moves = eval_pop(population, seeds, workers)
+            best = int(scores.argmax())
+            log_event("generation", generation=generation + 1, best=float(scores[best]),
+                      best_std=float(variances[best] ** 0.5), mean=float(scores.mean()),
+                      max_tile=int(max_tiles.max()), moves=float(moves.mean()))
+            if scores[best] > best_ever_score:
+                best_ever, best_ever_score = population[best].copy(), float(scores[best])
+            stats = np.vstack([stats, (scores[best], scores.mean(), variances[best] ** 0.5)])
+            closed = False
+            if window is not None:
+                closed = play_individu(population[best], game_value, window, random.Random(seeds[0])) is None
+
+            # Sélection des meilleurs individus 
+            with STATS.phase("select"):
+                parents = selection(population, scores, num_parents, tournament_size, rng)
+                elite = population[np.argpartition(-scores, elitism - 1)[:elitism]] if elitism else population[:0]
+
+            # Croisement 
+            with STATS.phase("crossover"):
+                children = crossover(parents, population_size - len(elite), rng)
+
+            # mutation (l'élite n'est pas mutée)
+            with STATS.phase("mutate"):
+                population = np.concatenate([elite, mutate(children, mutation_rate, rng)])
+
+            # Sauvegarde de la population 
+            with STATS.phase("save"):
+                save_pop(checkpoint_dir, generation + 1, population, scores, variances, rng, best_ever,
+                         best_ever_score, stats, seeds, keep)
+
+        if closed:
+            log_event("training_stop", generation=generation + 1)
+            break
 
     
 
@@ -479,9 +199,9 @@ def algorithme_genetique(game_value, window, generations=50, population_size=100
 
 
 
-def start_training():
+def start_training(window=None):
     game_value = Game_value()
-    algorithme_genetique(game_value, WINDOW)
+    algorithme_genetique(game_value, window)
 
 
 
@@ -492,7 +212,16 @@ def start_game(game_value):
     Returns:
         tuple: The result of the game function (e.g., game state and score).
     """
-    print("Lancement de l'entrainement")
+    from interface import get_window
+
+    log_event("training_start")
+    start_training(get_window())
+    return None
+
+
+if __name__ == "__main__":
+    # Entraînement sans affichage : python -m genetiques.geneticgameIA [--stats table] [--profile]
+    # [--log-file] [--trace-moves]
+    instrumentation.configure()
+    journal.configure()
     start_training()
-    return None  
-   
@@ -1,21 +1,19 @@
-import random
+import numpy as np
+from engine.bitboard import DIRECTIONS
 
 
 
-MOVES = ["left", "right", "up","down"]
+MOVES = DIRECTIONS  # Un gène est l'indice du mouvement dans MOVES (0 à 3)
+GENE_DTYPE = np.uint8
 
-def generate_random_individual(length=10):
+def generate_random_individual(length=10, rng=None):
     ''' Genere une sequence de mouvement aleatoires pour chaque individu'''
-    return [random.choice(MOVES) for _ in range (length)]
+    return generate_population(1, length, rng)[0]
 
 
-def generate_population(size = 100, move_length =20):
-    ''' Genere un tableau d'individu'''
-    return[generate_random_individual(move_length) for _ in range(size)]
-
-
-    
-    
-    
-
+def generate_population(size = 100, move_length =20, rng=None):
+    ''' Genere la population : une matrice (size, move_length) d'indices de mouvements'''
+    if rng is None:
+        rng = np.random.default_rng()
+    return rng.integers(0, len(MOVES), (size, move_length), dtype=GENE_DTYPE)
 
@@ -1,17 +1,91 @@
+import glob
 import json
+import os
+import numpy as np
+from engine.journal import log_event
 
+# Points de reprise de l'entraînement : un fichier npz par génération, écrit
+# dans un fichier temporaire puis renommé (un arrêt en pleine écriture ne
+# corrompt jamais le dernier point de reprise), dont on garde les KEEP derniers.
 
-def save_pop(population, generation, file_name="pop.json"):
-    with open(file_name, 'w') as f:
-        json.dump({{generation}: generation, "population": population},f)
-        
-        
-        
-def load_pop(file_name="pop.json"):
-    try:
-        with open(file_name, 'r') as f:
-            data = json.load(f)
-            return data["population"], data["generation"]
-    except FileNotFoundError:
-        print("File not found, new population ")
-        return [],0
\ No newline at end of file
+CHECKPOINT_DIR = "checkpoints"
+KEEP = 5  # Nombre de générations conservées
+STATS_COLUMNS = ("best", "mean", "best_std")  # Colonnes de l'historique par génération
+_PATTERN = "generation_*.npz"
+
+
+def _file_name(directory, generation):
+    return os.path.join(directory, f"generation_{generation:06d}.npz")
+
+
+def list_checkpoints(directory=CHECKPOINT_DIR):
+    """
+    Returns:
+        list: Les fichiers de points de reprise, du plus ancien au plus récent.
+    """
+    return sorted(glob.glob(os.path.join(directory, _PATTERN)))
+
+
+def save_pop(directory, generation, population, scores, variances, rng, best, best_score, stats, seeds,
+             keep=KEEP):
+    """
+    Enregistre l'état de l'entraînement après une génération.
+
+    Args:
+        directory (str): Le dossier des points de reprise (créé si besoin).
+        generation (int): Le nombre de générations terminées.
+        population (numpy.ndarray): La matrice (individus, gènes) de la prochaine génération.
+        scores (numpy.ndarray): Les scores moyens de la génération évaluée.
+        variances (numpy.ndarray): Leurs variances.
+        rng (numpy.random.Generator): Le générateur de l'algorithme, dont l'état est sauvé.
+        best (numpy.ndarray): Le meilleur individu depuis le début.
+        best_score (float): Son score.
+        stats (numpy.ndarray): L'historique (générations, STATS_COLUMNS).
+        seeds (list): Les graines de la génération évaluée.
+        keep (int): Nombre de points de reprise conservés.
+
+    Returns:
+        str: Le fichier écrit.
+    """
+    os.makedirs(directory, exist_ok=True)
+    file_name = _file_name(directory, generation)
+    temp_name = f"{file_name}.{os.getpid()}.tmp"
+    with open(temp_name, "wb") as f:
+        np.savez(
+            f,
+            generation=np.int64(generation),
+            population=population,
+            scores=scores,
+            variances=variances,
+            rng_state=np.array(json.dumps(rng.bit_generator.state)),
+            best=best,
+            best_score=np.float64(best_score),
+            stats=stats,
+            seeds=np.array(seeds, dtype=np.uint64),
+        )
+    os.replace(temp_name, file_name)
+
+    for old in list_checkpoints(directory)[:-keep]:
+        os.remove(old)
+    return file_name
+
+
+def load_pop(directory=CHECKPOINT_DIR):
+    """
+    Charge le point de reprise le plus récent.
+
+    Returns:
+        dict: L'état enregistré par save_pop (rng_state redevenu un dictionnaire,
+        seeds une liste), ou None s'il n'y a aucun point de reprise.
+    """
+    checkpoints = list_checkpoints(directory)
+    if not checkpoints:
+        log_event("checkpoint_missing", directory=directory)
+        return None
+    with np.load(checkpoints[-1]) as data:
+        state = {key: data[key] for key in data.files}
+    state["generation"] = int(state["generation"])
+    state["best_score"] = float(state["best_score"])
+    state["rng_state"] = json.loads(str(state["rng_state"]))
+    state["seeds"] = [int(seed) for seed in state["seeds"]]
+    return state
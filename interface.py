@@ -0,0 +1,399 @@
+import pygame
+import math
+import random
+from engine.bitboard import ROWS, COLS, finish_move, get_cell, move_with_transitions
+from engine.instrumentation import STATS
+
+# Rien n'est initialisé à l'import : la fenêtre et les polices ne sont créées
+# qu'à la première demande, pour que les modes sans affichage restent légers.
+
+WIDTH, HEIGHT = 800, 800
+
+RECT_HEIGHT = HEIGHT // ROWS
+RECT_WIDTH = WIDTH // COLS
+
+OUTLINE_COLOR = (187, 173, 160)
+OUTLINE_THICKNESS = 10
+BACKROUND_COLOR = (205, 192, 180)
+FONT_COLOR = (199, 110, 101)
+_TRANSPARENT = (255, 0, 255)  # Couleur transparente du calque des lignes de la grille
+
+ANIMATION_DURATION = 100  # Durée d'un déplacement animé, en millisecondes
+
+FONT_SIZE = 60
+SCORE_FONT_SIZE = 40
+
+_window = None
+_fonts = {}
+_glyphs = {}  # Surface de chaque tuile, par valeur
+_layers = {}  # Fond de la grille vide et calque des lignes
+_renderers = {}
+
+
+def get_window():
+    """
+    Creates the game window on the first call, and forgets what it shows.
+
+    Returns:
+        pygame.Surface: The game window.
+    """
+    global _window
+    if _window is None:
+        pygame.init()
+        _window = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("2048")
+    # Le menu a pu dessiner par-dessus : la prochaine image redessine toute la grille
+    get_renderer(_window).invalidate()
+    return _window
+
+
+def get_font(size):
+    """
+    Returns:
+        pygame.font.Font: The game font at the given size, loaded on the first call.
+    """
+    if size not in _fonts:
+        pygame.font.init()
+        _fonts[size] = pygame.font.SysFont("comicsans", size, bold=True)
+    return _fonts[size]
+
+
+class Tile:
+    COLORS = [
+        (237, 229, 218),
+        (238, 225, 201),
+        (243, 178, 122),
+        (246, 150, 101),
+        (247, 124, 95),
+        (247, 95, 59),
+        (237, 208, 115),
+        (237, 204, 99),
+        (236, 202, 80),
+    ]
+
+
+    def __init__(self, value, row, col):
+        self.value = value
+        self.row = row
+        self.col = col
+        self.x = col * RECT_WIDTH
+        self.y = row * RECT_HEIGHT
+
+    def get_info(self) :
+        return self.value,self.row,self.col
+
+
+    def get_color(self):
+        """
+        Returns:
+        tuple: The RGB color of the tile based on its value.
+        """
+        color_index = int(math.log2(self.value)) - 1
+        color = self.COLORS[min(color_index, len(self.COLORS) - 1)]
+        return color
+
+    def rect(self):
+        """
+        Returns:
+            pygame.Rect: The area covered by the tile at its current position.
+        """
+        return pygame.Rect(round(self.x), round(self.y), RECT_WIDTH, RECT_HEIGHT)
+
+    def draw(self, window):
+        """
+        Draws the tile on the game window with its value and color.
+
+        Args:
+            window (pygame.Surface): The game window where the tile is drawn.
+        """
+        window.blit(tile_surface(self.value), (round(self.x), round(self.y)))
+
+
+def tile_surface(value):
+    """
+    Renders a tile once per value: its color and its centered number.
+
+    Args:
+        value (int): The value of the tile (2, 4, 8...).
+
+    Returns:
+        pygame.Surface: The cached RECT_WIDTH x RECT_HEIGHT surface of the tile.
+    """
+    if value not in _glyphs:
+        surface = pygame.Surface((RECT_WIDTH, RECT_HEIGHT))
+        surface.fill(Tile(value, 0, 0).get_color())
+        text = get_font(FONT_SIZE).render(str(value), 1, FONT_COLOR)
+        surface.blit(
+            text,
+            (
+                RECT_WIDTH / 2 - text.get_width() / 2,
+                RECT_HEIGHT / 2 - text.get_height() / 2,
+            ),
+        )
+        _glyphs[value] = surface.convert() if pygame.display.get_surface() else surface
+    return _glyphs[value]
+
+
+def draw_grid(window):
+    """
+    Draws the grid lines and border of the game window.
+
+    Args:
+        window (pygame.Surface): The game window where the grid is drawn.
+    """
+    for row in range(1, ROWS):
+        y = row * RECT_HEIGHT
+        pygame.draw.line(window, OUTLINE_COLOR, (0, y), (WIDTH, y), OUTLINE_THICKNESS)
+
+    for col in range(1, COLS):
+        x = col * RECT_WIDTH
+        pygame.draw.line(window, OUTLINE_COLOR, (x, 0), (x, HEIGHT), OUTLINE_THICKNESS)
+
+    pygame.draw.rect(window, OUTLINE_COLOR, (0, 0, WIDTH, HEIGHT), OUTLINE_THICKNESS)
+
+
+def _layer(name):
+    """
+    Returns:
+        pygame.Surface: The cached empty grid ("background") or the grid lines
+        alone on a transparent surface ("grid"), drawn over the tiles.
+    """
+    if name not in _layers:
+        background = pygame.Surface((WIDTH, HEIGHT))
+        background.fill(BACKROUND_COLOR)
+        draw_grid(background)
+        grid = pygame.Surface((WIDTH, HEIGHT))
+        grid.fill(_TRANSPARENT)
+        draw_grid(grid)
+        grid.set_colorkey(_TRANSPARENT)
+        if pygame.display.get_surface():
+            background, grid = background.convert(), grid.convert()
+        _layers.update(background=background, grid=grid)
+    return _layers[name]
+
+
+class Renderer:
+    """
+    Redraws only what changed on the game window.
+
+    The renderer remembers the value shown in every cell and the score:
+    a frame repaints the changed cells from cached surfaces (tile_surface,
+    grid background) and updates only their rectangles on the screen.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.invalidate()
+
+    def invalidate(self):
+        """Forgets the screen content: the next frame repaints the whole grid."""
+        self.cells = [None] * (ROWS * COLS)
+        self.score = None
+        self.score_surface = None
+        self.score_rect = pygame.Rect(0, 0, 0, 0)
+
+    def _update_score(self, score):
+        """Renders the score if it changed; returns the rectangle to repaint."""
+        if score == self.score:
+            return None
+        old_rect = self.score_rect
+        self.score = score
+        self.score_surface = get_font(SCORE_FONT_SIZE).render(f"Score: {score}", 1, (0, 0, 0))
+        self.score_rect = self.score_surface.get_rect(midtop=(WIDTH // 2, 20))
+        return old_rect.union(self.score_rect) if old_rect.width else self.score_rect
+
+    def _paint(self, rect, tiles=()):
+        """Repaints an area: background, the tiles crossing it, grid lines, then the score."""
+        window = self.window
+        window.set_clip(rect)
+        window.blit(_layer("background"), rect, rect)
+        for tile in tiles:
+            if tile.rect().colliderect(rect):
+                tile.draw(window)
+        window.blit(_layer("grid"), rect, rect)
+        if self.score_rect.colliderect(rect):
+            window.blit(self.score_surface, self.score_rect)
+        window.set_clip(None)
+
+    def draw_board(self, board, score):
+        """
+        Draws a board, repainting only the cells whose value changed.
+
+        Args:
+            board (int): The packed board.
+            score (int): The score shown above the grid.
+
+        Returns:
+            list: The updated rectangles (empty if nothing changed).
+        """
+        score_area = self._update_score(score)
+        rects = []
+        for row in range(ROWS):
+            for col in range(COLS):
+                index = row * COLS + col
+                exponent = get_cell(board, row, col)
+                rect = pygame.Rect(col * RECT_WIDTH, row * RECT_HEIGHT, RECT_WIDTH, RECT_HEIGHT)
+                if exponent == self.cells[index] and not (score_area and score_area.colliderect(rect)):
+                    continue
+                self.cells[index] = exponent
+                self._paint(rect, [Tile(1 << exponent, row, col)] if exponent else ())
+                rects.append(rect)
+        if rects:
+            pygame.display.update(rects)
+        return rects
+
+    def draw_tiles(self, tiles, areas, score):
+        """
+        Draws tiles at any position (animation frame) inside the given areas.
+
+        Args:
+            tiles (list): The Tile objects, drawn in order.
+            areas (list): The pygame.Rect areas to repaint; the cells they cover
+                are repainted by the next draw_board.
+            score (int): The score shown above the grid.
+        """
+        score_area = self._update_score(score)
+        if score_area:
+            areas = areas + [score_area]
+        for rect in areas:
+            self._paint(rect, tiles)
+            for row in range(rect.top // RECT_HEIGHT, min(ROWS, -(-rect.bottom // RECT_HEIGHT))):
+                for col in range(rect.left // RECT_WIDTH, min(COLS, -(-rect.right // RECT_WIDTH))):
+                    self.cells[row * COLS + col] = None
+        pygame.display.update(areas)
+
+
+def get_renderer(window):
+    """
+    Returns:
+        Renderer: The renderer of a window, created on the first call.
+    """
+    if window not in _renderers:
+        _renderers[window] = Renderer(window)
+    return _renderers[window]
+
+
+def draw(window, game_value):
+    """
+    Draws the game: the tiles whose value changed since the last frame, and the score.
+
+    Args:
+        window (pygame.Surface): The game window.
+        game_value (Game_value): The object containing the board and the score.
+    """
+    with STATS.phase("render"):
+        get_renderer(window).draw_board(game_value.board, game_value.score)
+
+
+class Animator:
+    """
+    Interpolates the tile transitions of a move over time.
+
+    The move itself is already resolved by the engine: the animator only
+    slides the tiles of the previous board towards their destination, then
+    draws the final board.
+    """
+
+    def __init__(self, duration=ANIMATION_DURATION):
+        self.duration = duration
+        self.tiles = []
+        self.areas = []
+        self.old_board = 0
+        self.shown = False
+        self.start_time = None
+
+    def start(self, old_board, transitions):
+        """
+        Starts the animation of a move.
+
+        Args:
+            old_board (int): The packed board before the move.
+            transitions (list): The transitions returned by move_with_transitions.
+        """
+        self.tiles = [
+            (1 << get_cell(old_board, *source), source, target, merged)
+            for source, target, merged in transitions
+        ]
+        # Seules les lignes ou colonnes parcourues par une tuile sont redessinées
+        self.areas = []
+        for _, (row, col), (to_row, to_col), _ in self.tiles:
+            if (row, col) != (to_row, to_col):
+                area = pygame.Rect(col * RECT_WIDTH, row * RECT_HEIGHT, RECT_WIDTH, RECT_HEIGHT).union(
+                    (to_col * RECT_WIDTH, to_row * RECT_HEIGHT, RECT_WIDTH, RECT_HEIGHT))
+                if area.collidelist(self.areas) < 0:
+                    self.areas.append(area)
+                else:
+                    self.areas[area.collidelist(self.areas)].union_ip(area)
+        self.old_board = old_board
+        self.shown = False
+        self.start_time = pygame.time.get_ticks()
+
+    def is_running(self):
+        return self.start_time is not None
+
+    def draw(self, window, game_value):
+        """
+        Draws the current frame of the animation.
+
+        Args:
+            window (pygame.Surface): The game window.
+            game_value (Game_value): The object containing the final board and the score.
+
+        Returns:
+            bool: True while the animation is still running.
+        """
+        if self.start_time is None:
+            draw(window, game_value)
+            return False
+
+        progress = (pygame.time.get_ticks() - self.start_time) / max(self.duration, 1)
+        if progress >= 1 or not self.areas:
+            self.start_time = None
+            draw(window, game_value)
+            return False
+
+        with STATS.phase("render"):
+            renderer = get_renderer(window)
+            if not self.shown:
+                # Le reste de l'écran doit montrer le plateau d'avant le coup
+                renderer.draw_board(self.old_board, game_value.score)
+                self.shown = True
+            tiles = []
+            # Les tuiles absorbées passent sous celles qui restent
+            for value, (row, col), (to_row, to_col), merged in sorted(self.tiles, key=lambda t: not t[3]):
+                tile = Tile(value, row, col)
+                tile.x += (to_col - col) * RECT_WIDTH * progress
+                tile.y += (to_row - row) * RECT_HEIGHT * progress
+                tiles.append(tile)
+            renderer.draw_tiles(tiles, self.areas, game_value.score)
+        return True
+
+
+def move_tiles(window, clock, direction, game_value, fps=60, duration=ANIMATION_DURATION, rng=random):
+    """
+    Plays a move on the board and animates it when a window is given.
+
+    Args:
+        window (pygame.Surface): The game window, or None to skip the animation.
+        clock (pygame.time.Clock): The game clock to control the frame rate.
+        direction (str): The direction of movement ("left", "right", "up", "down").
+        game_value (Game_value): The object containing game-related information.
+        fps (int): Frame rate of the animation.
+        duration (int): Duration of the animation in milliseconds.
+        rng (random.Random): The random generator used for the spawn.
+
+    Returns:
+        str: "continue" if the game continues, or "lost" if the game is over.
+    """
+    old_board = game_value.board
+    with STATS.phase("move"):
+        board, gain, transitions = move_with_transitions(old_board, direction)
+    reponse = finish_move(game_value, board, gain, rng)
+
+    if window is not None:
+        animator = Animator(duration)
+        animator.start(old_board, transitions)
+        while animator.draw(window, game_value):
+            clock.tick(fps)
+
+    return reponse
@@ -1,47 +1,236 @@
-from copy import deepcopy
-import random
-import montecarlo.gameIAMontecarlo as gameIAMontecarlo
-import pygame
+import math
+import time
+import numpy as np
+from engine.bitboard import DIRECTIONS, legal_mask
+from engine.instrumentation import STATS
+from engine.symmetry import canonical
+from montecarlo.pool import get_pool, play_rollouts
 
-directions = ["left", "right", "up", "down"]
+directions = DIRECTIONS
 nbGame = 50  # Nombre de simulations par direction
 
-def montecarlo(current_game):
-    max_score = 0
-    best_direction = None
-    original_tiles = deepcopy(current_game.tabOfInfo)
+MIN_BATCH = 16  # Simulations par direction entre deux décisions de l'allocation adaptative
+CONFIDENCE_Z = 2.58  # Intervalle de confiance (99 %) pour l'arrêt anticipé
+CUTOFF = 10  # Coups aléatoires joués avant l'évaluation par le réseau de n-uplets
+COMMON_RANDOM_NUMBERS = True  # Mêmes tirages (apparitions, coups aléatoires) pour chaque premier mouvement
+
+
+def simulate(board, moves, nb_games, rng, workers=None, evaluator=None, cutoff=CUTOFF,
+             common=COMMON_RANDOM_NUMBERS):
+    """
+    Joue nb_games parties aléatoires après chacun des premiers mouvements donnés.
+
+    Args:
+        board (int): Le plateau de départ.
+        moves (list): Indices dans directions des premiers mouvements à évaluer.
+        nb_games (int): Nombre de simulations par mouvement.
+        rng (numpy.random.Generator): Générateur aléatoire des simulations.
+        workers (int): Nombre de processus du pool, None pour jouer dans le processus courant.
+        evaluator (NTupleNetwork): Réseau de n-uplets qui estime la fin des parties ;
+            None pour jouer les parties aléatoires jusqu'au bout.
+        cutoff (int): Nombre de coups aléatoires joués avant l'évaluation par evaluator.
+        common (bool): True pour que la i-ème partie de chaque direction suive le même
+            flux aléatoire : les directions sont comparées sur les mêmes apparitions de
+            tuiles, ce qui réduit fortement la variance de leur différence.
+
+    Returns:
+        numpy.ndarray: Pour chaque direction, (somme des scores, somme des carrés, nombre de
+        parties), les scores étant comptés à partir de board.
+    """
+    STATS.count("rollouts", len(moves) * nb_games)
+    with STATS.phase("rollout_batch"):
+        if workers:
+            # Les processus ne renvoient que des sommes par direction
+            return get_pool(workers).evaluate(board, nb_games, rng, moves, evaluator, cutoff, common)
+
+        # Simuler le premier mouvement de chaque direction, puis les mouvements aléatoires
+        first_moves = np.repeat(moves, nb_games)
+        streams = np.tile(np.arange(nb_games), len(moves)) if common else None
+        scores = play_rollouts(board, first_moves, rng, evaluator, cutoff, streams)
+
+        sums = np.zeros((len(directions), 3))
+        np.add.at(sums[:, 0], first_moves, scores)
+        np.add.at(sums[:, 1], first_moves, scores * scores)
+        np.add.at(sums[:, 2], first_moves, 1)
+        return sums
 
-    for direction in directions:
-        total_score = 0
 
-        for _ in range(nbGame):
-            # Préparer la simulation
-            simulated_game = gameIAMontecarlo.Game_value()
-            simulated_game.tabOfInfo = deepcopy(original_tiles)
-            simulated_game.score = current_game.score
+def montecarlo(current_game, nb_games=nbGame, rng=None, workers=None, table=None, evaluator=None, cutoff=CUTOFF,
+               common=COMMON_RANDOM_NUMBERS):
+    """
+    Choisit la direction dont les parties aléatoires donnent le meilleur score moyen.
 
-            # Convertir tabOfInfo en dictionnaire de tuiles
-            simulated_tiles = {
-                f"{tile[1]}{tile[2]}": gameIAMontecarlo.Tile(tile[0], tile[1], tile[2])
-                for tile in simulated_game.tabOfInfo
-            }
+    Les nb_games parties des quatre directions sont jouées ensemble, en un
+    seul lot numpy, jusqu'à ce qu'elles soient toutes perdues.
 
-            # Simuler le premier mouvement
-            response, score = gameIAMontecarlo.move_tiles(None, simulated_tiles, pygame.time.Clock(), direction, simulated_game)
+    Args:
+        current_game (Game_value): État actuel du jeu.
+        nb_games (int): Nombre de simulations par direction.
+        rng (numpy.random.Generator): Générateur aléatoire des simulations.
+        workers (int): Nombre de processus du pool de simulations, None pour tout
+            jouer dans le processus courant.
+        table (TranspositionTable): Cache des sommes de simulations par plateau
+            canonique (les 8 symétries partagent une entrée). Une position déjà
+            simulée au moins nb_games fois n'est pas rejouée, sinon les nouvelles
+            simulations s'ajoutent aux anciennes.
+        evaluator (NTupleNetwork): Réseau qui estime la fin des parties coupées après
+            cutoff coups ; la table ne doit pas mélanger simulations avec et sans réseau.
+        cutoff (int): Nombre de coups aléatoires joués avant l'évaluation.
+        common (bool): True pour simuler chaque direction sur les mêmes flux aléatoires.
 
-            # Simuler les mouvements aléatoires jusqu'à la fin de la partie
-            while response != "lost":
-                random_direction = random.choice(directions)
-                response, score = gameIAMontecarlo.move_tiles(None, simulated_tiles, pygame.time.Clock(), random_direction, simulated_game)
+    Returns:
+        str: La meilleure direction ("left", "right", "up", "down"), None si aucun
+        mouvement ne change le plateau.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
 
-            total_score += simulated_game.score
+    with STATS.scope("decision"):
+        return _montecarlo(current_game, nb_games, rng, workers, table, evaluator, cutoff, common)
 
-        # Calculer le score moyen pour cette direction
-        average_score = total_score / nbGame
 
+def _legal(board):
+    """Indices dans directions des mouvements qui changent le plateau."""
+    mask = legal_mask(board)
+    return [move for move in range(len(directions)) if mask >> move & 1]
+
+
+def _montecarlo(current_game, nb_games, rng, workers, table, evaluator, cutoff, common):
+    board = current_game.board
+    # Les mouvements sans effet ne sont pas simulés
+    legal = _legal(board)
+    if not legal:
+        return None
+    if len(legal) == 1:
+        # Un seul coup possible : rien à comparer
+        return directions[legal[0]]
+    cached = None
+    if table is not None:
+        # Les sommes sont rangées dans l'ordre des coups du plateau canonique
+        with STATS.phase("cache_lookup"):
+            key, to_canonical, from_canonical = canonical(board)
+            cached = table.get_entry(key)
+    if cached is not None and cached[2] >= nb_games:
+        sums = cached[0][list(to_canonical)]
+    else:
+        sums = simulate(board, legal, nb_games, rng, workers, evaluator, cutoff, common)
+        if cached is not None:
+            sums = sums + cached[0][list(to_canonical)]
+        if table is not None:
+            table.put(key, sums[list(from_canonical)], visits=int(sums[legal, 2].min()))
+
+    # Calculer le score moyen pour chaque direction légale
+    average_scores = current_game.score + sums[legal, 0] / sums[legal, 2]
+
+    max_score = float("-inf")
+    best_direction = None
+    for move, average_score in zip(legal, average_scores):
+        direction = directions[move]
         # Mettre à jour la meilleure direction si nécessaire
         if average_score > max_score:
             max_score = average_score
             best_direction = direction
 
     return best_direction
+
+
+def _bounds(sums):
+    """Moyenne et demi-largeur de l'intervalle de confiance de chaque direction."""
+    counts = np.maximum(sums[:, 2], 1)
+    means = sums[:, 0] / counts
+    variances = np.maximum(sums[:, 1] / counts - means * means, 0)
+    return means, CONFIDENCE_Z * np.sqrt(variances / counts)
+
+
+def montecarlo_adaptatif(current_game, time_budget=None, rollout_budget=None, rng=None, workers=None,
+                         evaluator=None, cutoff=CUTOFF, common=COMMON_RANDOM_NUMBERS, stop=None):
+    """
+    Monte Carlo à budget : répartit les simulations par éliminations successives (successive halving).
+
+    Le budget est découpé en phases. Pendant une phase, les directions encore
+    candidates reçoivent des lots de simulations de taille croissante, puis
+    la moitié la moins bonne est éliminée. La recherche s'arrête dès qu'une
+    direction domine nettement les autres (intervalles de confiance disjoints).
+
+    Args:
+        current_game (Game_value): État actuel du jeu.
+        time_budget (float): Temps maximal de décision, en secondes.
+        rollout_budget (int): Nombre maximal de simulations, toutes directions confondues.
+        rng (numpy.random.Generator): Générateur aléatoire des simulations.
+        workers (int): Nombre de processus du pool, None pour jouer dans le processus courant.
+        evaluator (NTupleNetwork): Réseau qui estime la fin des parties coupées après cutoff coups.
+        cutoff (int): Nombre de coups aléatoires joués avant l'évaluation.
+        common (bool): True pour simuler les directions candidates sur les mêmes flux aléatoires.
+        stop (threading.Event): Arrêt demandé de l'extérieur (échéance, fenêtre fermée) :
+            la recherche s'arrête après le lot en cours et rend la meilleure direction trouvée.
+
+    Returns:
+        tuple: La meilleure direction (None si aucun mouvement ne change le plateau) et
+        un dictionnaire direction -> {"rollouts", "mean"}.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if time_budget is None and rollout_budget is None:
+        rollout_budget = nbGame * len(directions)
+
+    with STATS.scope("decision"):
+        return _montecarlo_adaptatif(current_game, time_budget, rollout_budget, rng, workers, evaluator, cutoff,
+                                     common, stop)
+
+
+def _montecarlo_adaptatif(current_game, time_budget, rollout_budget, rng, workers, evaluator, cutoff, common,
+                          stop):
+    start = time.perf_counter()
+    # Seuls les mouvements légaux sont candidats ; un seul : aucune simulation
+    candidates = _legal(current_game.board)
+    if not candidates:
+        return None, {direction: {"rollouts": 0, "mean": float(current_game.score)} for direction in directions}
+    nb_phases = math.ceil(math.log2(len(candidates)))
+    sums = np.zeros((len(directions), 3))
+    spent = 0
+
+    for phase in range(1, nb_phases + 1):
+        phase_end_time = None if time_budget is None else start + time_budget * phase / nb_phases
+        phase_end_rollouts = None if rollout_budget is None else rollout_budget * phase // nb_phases
+        batch = MIN_BATCH
+        while True:
+            if phase_end_rollouts is not None:
+                batch = min(batch, (phase_end_rollouts - spent) // len(candidates))
+                if batch <= 0:
+                    break
+            sums += simulate(current_game.board, candidates, batch, rng, workers, evaluator, cutoff, common)
+            spent += batch * len(candidates)
+            if stop is not None and stop.is_set():
+                break
+
+            means, margins = _bounds(sums)
+            best = max(candidates, key=lambda move: means[move])
+            # Arrêt anticipé : la direction en tête est nettement meilleure que toutes les autres
+            if all(means[best] - margins[best] > means[move] + margins[move]
+                   for move in candidates if move != best):
+                candidates = [best]
+                break
+
+            batch *= 2
+            if phase_end_time is not None:
+                now = time.perf_counter()
+                if now >= phase_end_time:
+                    break
+                # Le lot suivant doit tenir dans le temps restant de la phase
+                rate = spent / (now - start)
+                batch = max(MIN_BATCH, min(batch, int(rate * (phase_end_time - now) / len(candidates))))
+
+        if len(candidates) == 1 or (stop is not None and stop.is_set()):
+            break
+        # Élimination de la moitié la moins bonne
+        means, _ = _bounds(sums)
+        candidates.sort(key=lambda move: means[move], reverse=True)
+        candidates = candidates[:max(1, len(candidates) // 2)]
+
+    means, _ = _bounds(sums)
+    best_direction = directions[max(candidates, key=lambda move: means[move])]
+    stats = {
+        direction: {"rollouts": int(sums[move, 2]), "mean": current_game.score + float(means[move])}
+        for move, direction in enumerate(directions)
+    }
+    return best_direction, stats
@@ -0,0 +1,153 @@
+import os
+import numpy as np
+from engine.bitboard import DIRECTIONS
+from engine.pool import make_pool, session_pool
+
+NB_WORKERS = os.cpu_count() or 1
+CHUNK_SIZE = 1024  # Nombre maximal de parties par tâche envoyée à un processus
+
+
+def _init_worker():
+    """Précharge le moteur (et ses tables) une seule fois par processus, sans pygame."""
+    import engine.batch  # noqa: F401
+
+
+def play_rollouts(board, first_moves, rng, evaluator=None, cutoff=None, streams=None):
+    """
+    Joue une partie aléatoire après chacun des premiers mouvements donnés.
+
+    Args:
+        board (int): Le plateau de départ.
+        first_moves (numpy.ndarray): Le premier mouvement (indice dans DIRECTIONS) de chaque partie.
+        rng (numpy.random.Generator): Générateur aléatoire des simulations.
+        evaluator (NTupleNetwork): Si donné, les parties s'arrêtent après cutoff coups
+            aléatoires et la valeur estimée du plateau atteint s'ajoute au score.
+        cutoff (int): Nombre de coups aléatoires joués avant l'évaluation.
+        streams (numpy.ndarray): Flux aléatoire de chaque partie : les parties de même flux
+            voient les mêmes tirages (nombres aléatoires communs), None pour des tirages indépendants.
+
+    Returns:
+        numpy.ndarray: Le score de chaque partie, compté à partir de board.
+    """
+    from engine.batch import play_move_batch, random_moves_batch
+
+    uniforms = None
+    if streams is not None:
+        streams = np.asarray(streams)
+        uniforms = rng.random((2, int(streams.max()) + 1))[:, streams]
+    boards = np.full(len(first_moves), board, dtype=np.uint64)
+    boards, scores, _ = play_move_batch(boards, first_moves, rng, uniforms)
+    # Les parties perdues dès le premier mouvement ne bougent plus
+    max_moves = cutoff if evaluator is not None else None
+    boards, scores, running = random_moves_batch(boards, scores, rng, max_moves, streams)
+    scores = scores.astype(np.float64)
+    if evaluator is not None:
+        # Les parties coupées avant la fin sont complétées par l'estimation du réseau
+        scores[running] += evaluator.evaluate_batch(boards[running])
+    return scores
+
+
+def rollout_job(job):
+    """
+    Joue un lot de parties aléatoires après un premier mouvement imposé.
+
+    Args:
+        job (tuple): (board, first_move, count, seed, weights, cutoff, common), first_move
+            étant un indice dans DIRECTIONS, weights le fichier du réseau de n-uplets (ou None)
+            et common True pour que la i-ème partie de la tâche suive le i-ème flux de la graine.
+
+    Returns:
+        tuple: (first_move, somme des scores, somme des carrés, nombre de parties), les
+        scores étant comptés à partir du plateau reçu.
+    """
+    board, first_move, count, seed, weights, cutoff, common = job
+    evaluator = None
+    if weights is not None:
+        from ntuple.ntuple import NTupleNetwork
+        evaluator = NTupleNetwork.shared(weights)
+    streams = np.arange(count) if common else None
+    scores = play_rollouts(board, np.full(count, first_move), np.random.default_rng(seed), evaluator, cutoff, streams)
+    return first_move, float(scores.sum()), float((scores * scores).sum()), count
+
+
+class RolloutPool:
+    """
+    Pool de processus persistant pour les simulations Monte Carlo.
+
+    Les processus sont lancés une fois et gardent le moteur chargé ; chaque
+    tâche ne renvoie que des sommes, quelques flottants par lot de parties.
+    """
+
+    def __init__(self, workers=NB_WORKERS, chunk_size=CHUNK_SIZE):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool = make_pool(workers, _init_worker)
+
+    def run(self, jobs):
+        """
+        Exécute des tâches (board, first_move, count, seed, weights, cutoff, common) sur le pool.
+
+        Returns:
+            numpy.ndarray: Pour chaque direction, (somme, somme des carrés, nombre de parties).
+        """
+        sums = np.zeros((len(DIRECTIONS), 3))
+        for first_move, total, total_sq, count in self._pool.imap_unordered(rollout_job, jobs):
+            sums[first_move] += (total, total_sq, count)
+        return sums
+
+    def evaluate(self, board, nb_games, rng, moves=range(len(DIRECTIONS)), evaluator=None, cutoff=None,
+                 common=False):
+        """
+        Répartit nb_games parties par direction entre les processus.
+
+        Args:
+            board (int): Le plateau de départ.
+            nb_games (int): Nombre de parties par direction.
+            rng (numpy.random.Generator): Générateur qui fournit la graine de chaque tâche.
+            moves (iterable): Indices des directions à évaluer.
+            evaluator (NTupleNetwork): Réseau d'évaluation des parties coupées ; il doit avoir
+                été chargé depuis un fichier, que chaque processus projette en mémoire.
+            cutoff (int): Nombre de coups aléatoires avant l'évaluation.
+            common (bool): True pour jouer chaque direction sur les mêmes graines
+                (nombres aléatoires communs).
+
+        Returns:
+            numpy.ndarray: Pour chaque direction, (somme, somme des carrés, nombre de parties).
+        """
+        # Assez de tâches pour occuper tous les processus, sans dépasser chunk_size parties
+        moves = list(moves)
+        weights = None
+        if evaluator is not None:
+            if evaluator.path is None:
+                raise ValueError("Le réseau doit être enregistré (save) avant d'être partagé avec le pool")
+            weights = evaluator.path
+        per_move = max(1, -(-self.workers // max(len(moves), 1)))
+        chunk = min(self.chunk_size, max(1, -(-nb_games // per_move)))
+        counts = [min(chunk, nb_games - start) for start in range(0, nb_games, chunk)]
+        seeds = None
+        jobs = []
+        for first_move in moves:
+            # Avec les nombres aléatoires communs, toutes les directions reprennent les mêmes graines
+            if seeds is None or not common:
+                seeds = [int(seed) for seed in rng.integers(2**63, size=len(counts))]
+            jobs.extend((board, first_move, count, seed, weights, cutoff, common)
+                        for count, seed in zip(counts, seeds))
+        return self.run(jobs)
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def get_pool(workers=NB_WORKERS):
+    """
+    Returns:
+        RolloutPool: Le pool de la session, créé au premier appel et fermé à la sortie.
+    """
+    return session_pool("rollouts", workers, RolloutPool)
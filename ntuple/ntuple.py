@@ -0,0 +1,228 @@
+import argparse
+import os
+import random
+import time
+import numpy as np
+from engine.batch import as_boards, symmetries_batch
+from engine.bitboard import legal_moves, new_board, spawn
+from engine import instrumentation, journal
+from engine.journal import log_event
+from engine.symmetry import symmetries
+
+# Réseau de n-uplets : la valeur d'un plateau est la somme, sur chaque
+# n-uplet de cases et chacune des 8 symétries du plateau, d'un poids lu dans
+# une table indexée par les exposants des cases du n-uplet.
+
+# Cases indexées par 4 * row + col : deux lignes et deux carrés 2x2
+TUPLES = [
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 1, 4, 5),
+    (1, 2, 5, 6),
+]
+
+WEIGHTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights.bin")
+_MAGIC = b"2048NTP1"
+_HEADER_SIZE = 64  # Magic, nombre et taille des n-uplets, cases, complété par des zéros
+
+ALPHA = 0.1  # Pas d'apprentissage, réparti entre tous les poids mis à jour
+
+_shared = {}  # Réseaux déjà projetés en mémoire dans ce processus, par fichier
+
+
+def _tuple_shifts(tuples):
+    return [[4 * cell for cell in cells] for cells in tuples]
+
+
+class NTupleNetwork:
+    """
+    Fonction de valeur par n-uplets.
+
+    Les poids forment un tableau float32 (nombre de n-uplets, 16 ** taille)
+    qui peut être projeté en mémoire (numpy.memmap) : le chargement est
+    immédiat et les processus qui lisent le même fichier partagent ses pages.
+    """
+
+    def __init__(self, weights=None, tuples=TUPLES, path=None):
+        self.tuples = [tuple(cells) for cells in tuples]
+        size = len(self.tuples[0])
+        if weights is None:
+            weights = np.zeros((len(self.tuples), 16 ** size), dtype=np.float32)
+        self.weights = weights
+        self.path = path
+        self._shifts = _tuple_shifts(self.tuples)
+        self._features = 8 * len(self.tuples)
+
+    @classmethod
+    def load(cls, path=WEIGHTS_FILE, writable=False):
+        """
+        Projette un fichier de poids en mémoire, sans le lire.
+
+        Args:
+            path (str): Le fichier écrit par save.
+            writable (bool): True pour que les mises à jour soient écrites dans le fichier.
+
+        Returns:
+            NTupleNetwork: Le réseau.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+        if header[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} n'est pas un fichier de poids de n-uplets")
+        count, size = header[8], header[9]
+        cells = header[10:10 + count * size]
+        tuples = [tuple(cells[i * size:(i + 1) * size]) for i in range(count)]
+        weights = np.memmap(path, dtype="<f4", mode="r+" if writable else "r",
+                            offset=_HEADER_SIZE, shape=(count, 16 ** size))
+        return cls(weights, tuples, path)
+
+    @classmethod
+    def shared(cls, path=WEIGHTS_FILE):
+        """
+        Le réseau du fichier path, chargé une fois par processus (en lecture seule) :
+        les processus d'un pool partagent ainsi les pages du fichier.
+
+        Returns:
+            NTupleNetwork: Le réseau.
+        """
+        if path not in _shared:
+            _shared[path] = cls.load(path)
+        return _shared[path]
+
+    def save(self, path=WEIGHTS_FILE):
+        """
+        Écrit les poids bruts (float32) après un petit en-tête, par fichier temporaire et renommage.
+        """
+        size = len(self.tuples[0])
+        header = _MAGIC + bytes([len(self.tuples), size]) + bytes(cell for cells in self.tuples for cell in cells)
+        temp_name = f"{path}.{os.getpid()}.tmp"
+        with open(temp_name, "wb") as f:
+            f.write(header.ljust(_HEADER_SIZE, b"\0"))
+            f.write(np.ascontiguousarray(self.weights, dtype="<f4").tobytes())
+        os.replace(temp_name, path)
+        self.path = path
+
+    def _indices(self, board):
+        for image in symmetries(board):
+            for number, shifts in enumerate(self._shifts):
+                index = 0
+                for position, shift in enumerate(shifts):
+                    index |= ((image >> shift) & 0xF) << (4 * position)
+                yield number, index
+
+    def evaluate(self, board):
+        """
+        Args:
+            board (int): Le plateau compacté.
+
+        Returns:
+            float: La valeur estimée du plateau (score encore à gagner).
+        """
+        weights = self.weights
+        return float(sum(weights[number, index] for number, index in self._indices(board)))
+
+    def evaluate_batch(self, boards):
+        """
+        Args:
+            boards (numpy.ndarray): N plateaux compactés (uint64).
+
+        Returns:
+            numpy.ndarray: Les N valeurs estimées.
+        """
+        values = np.zeros(len(boards), dtype=np.float64)
+        for image in symmetries_batch(as_boards(boards)):
+            for number, shifts in enumerate(self._shifts):
+                index = np.zeros(len(boards), dtype=np.intp)
+                for position, shift in enumerate(shifts):
+                    index |= ((image >> np.uint64(shift)) & np.uint64(0xF)).astype(np.intp) << (4 * position)
+                values += self.weights[number][index]
+        return values
+
+    def update(self, board, delta):
+        """
+        Ajoute delta à la valeur du plateau, réparti sur tous les poids qui la composent.
+        """
+        step = delta / self._features
+        for number, index in self._indices(board):
+            self.weights[number, index] += step
+
+    def best_move(self, board):
+        """
+        Returns:
+            tuple: Le coup qui maximise gain + valeur du plateau obtenu, le plateau
+            obtenu et le gain (None, board, 0 si aucun coup n'est possible).
+        """
+        best = (None, board, 0)
+        best_value = None
+        for direction, after, gain in legal_moves(board):
+            value = gain + self.evaluate(after)
+            if best_value is None or value > best_value:
+                best_value = value
+                best = (direction, after, gain)
+        return best
+
+
+def train(network, nb_games, alpha=ALPHA, rng=random, report_every=100):
+    """
+    Apprentissage TD(0) par parties contre soi-même, sur les plateaux après coup (afterstates).
+
+    Args:
+        network (NTupleNetwork): Le réseau à entraîner (poids modifiables).
+        nb_games (int): Nombre de parties jouées.
+        alpha (float): Pas d'apprentissage.
+        rng (random.Random): Générateur aléatoire des apparitions de tuiles.
+        report_every (int): Journalise le score moyen toutes les report_every parties.
+
+    Returns:
+        list: Le score de chaque partie.
+    """
+    scores = []
+    start = time.perf_counter()
+    for game_number in range(1, nb_games + 1):
+        board = new_board(rng)
+        score = 0
+        previous = None
+        while True:
+            direction, after, gain = network.best_move(board)
+            if direction is None:
+                # Fin de partie : la valeur du dernier plateau après coup tend vers 0
+                if previous is not None:
+                    network.update(previous, -alpha * network.evaluate(previous))
+                break
+            if previous is not None:
+                error = gain + network.evaluate(after) - network.evaluate(previous)
+                network.update(previous, alpha * error)
+            previous = after
+            score += gain
+            board = spawn(after, rng)
+        scores.append(score)
+
+        if report_every and game_number % report_every == 0:
+            recent = scores[-report_every:]
+            log_event("training", games=game_number, mean=sum(recent) / len(recent), best=max(recent),
+                      seconds=round(time.perf_counter() - start, 1))
+    return scores
+
+
+if __name__ == "__main__":
+    # Entraînement sans affichage : python -m ntuple.ntuple --games 1000
+    parser = argparse.ArgumentParser(description="Entraînement TD(0) du réseau de n-uplets")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--weights", default=WEIGHTS_FILE)
+    parser.add_argument("--resume", action="store_true", help="repartir des poids existants")
+    instrumentation.add_arguments(parser)
+    journal.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.setup(args.stats, args.stats_file, args.profile)
+    journal.setup(args.log_level, args.log_file, args.trace_moves)
+
+    if args.resume and os.path.exists(args.weights):
+        network = NTupleNetwork.load(args.weights)
+        network.weights = np.array(network.weights)
+    else:
+        network = NTupleNetwork()
+    train(network, args.games, args.alpha, random.Random(args.seed))
+    network.save(args.weights)
+    log_event("weights_saved", path=args.weights)
@@ -0,0 +1,379 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+import numpy as np
+from engine.bitboard import Game_value, apply_move, legal_moves, max_tile, new_board
+from engine import instrumentation, journal
+from engine.instrumentation import STATS
+from engine.journal import log_event
+from engine.pool import make_pool
+from engine.trajectory import GameTrajectory, TrajectoryWriter
+
+# Parties complètes sans affichage, en parallèle, pour évaluer un agent :
+#
+#   python -m play.play --agent montecarlo --games 10000 --workers 16 --seed 1 --budget 50ms
+#   python -m play.play --agent expectimax --depth 3 --games 200 --output expectimax.json --csv games.csv
+#
+# Le rapport donne la distribution des scores, la part des parties atteignant
+# 512, 1024 et 2048, le nombre de coups par partie et les centiles de la
+# latence des décisions. Chaque partie a sa graine, tirée de --seed : deux
+# lancements identiques jouent les mêmes parties.
+
+AGENTS = ("random", "montecarlo", "genetique", "expectimax")
+TILE_THRESHOLDS = (512, 1024, 2048)
+SCORE_PERCENTILES = (10, 25, 50, 75, 90, 99)
+LATENCY_PERCENTILES = (50, 90, 99, 99.9)
+CSV_COLUMNS = ("game", "seed", "score", "max_tile", "moves", "seconds", "decision_ms_mean", "decision_ms_max")
+
+
+def parse_duration(text):
+    """
+    Lit une durée : "50ms", "0.5s" ou un nombre de secondes.
+
+    Returns:
+        float: La durée en secondes (None pour None).
+    """
+    if text is None:
+        return None
+    match = re.fullmatch(r"\s*([0-9.]+)\s*(ms|s)?\s*", text)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"durée invalide : {text!r} (exemples : 50ms, 0.5s)")
+    value = float(match.group(1))
+    return value / 1000 if match.group(2) == "ms" else value
+
+
+def positive_int(text):
+    """Lit un entier strictement positif (nombre de parties, de processus)."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"entier positif attendu : {text!r}")
+    return value
+
+
+def _network(path):
+    """Le réseau de n-uplets du fichier path, partagé dans le processus ; None sans fichier."""
+    if not path:
+        return None
+    from ntuple.ntuple import NTupleNetwork
+    return NTupleNetwork.shared(path)
+
+
+def make_agent(options, seed):
+    """
+    Crée l'agent d'une partie.
+
+    Args:
+        options (dict): Les options de l'agent (agent, budget, rollouts, depth, network, genome).
+        seed (int): La graine de la partie, pour les tirages propres à l'agent.
+
+    Returns:
+        callable: game_value -> (direction, statistiques), la direction valant None quand
+        l'agent s'arrête ; les statistiques sont {"rollouts", "values"} ou None.
+    """
+    name = options["agent"]
+    if name == "random":
+        rng = random.Random(seed)
+
+        def decide(game_value):
+            moves = legal_moves(game_value.board)
+            return (moves[rng.randrange(len(moves))][0] if moves else None), None
+        return decide
+
+    if name == "montecarlo":
+        from montecarlo.montecarlo import montecarlo_adaptatif
+        rng = np.random.default_rng(seed)
+        evaluator = _network(options["network"])
+
+        def decide(game_value):
+            direction, stats = montecarlo_adaptatif(game_value, options["budget"], options["rollouts"], rng,
+                                                    evaluator=evaluator)
+            return direction, {
+                "rollouts": sum(stat["rollouts"] for stat in stats.values()),
+                "values": {name: stat["mean"] for name, stat in stats.items() if stat["rollouts"]},
+            }
+        return decide
+
+    if name == "expectimax":
+        from engine.decision import Deadline
+        from engine.transposition import TranspositionTable
+        from expectimax.expectimax import DEPTH, expectimax, heuristic
+        from expectimax.gameIAExpectimax import TABLE_MEGABYTES, TABLE_SIZE
+        depth = options["depth"] or DEPTH
+        table = TranspositionTable(TABLE_SIZE, max_megabytes=TABLE_MEGABYTES)
+        network = _network(options["network"])
+        evaluate = heuristic if network is None else network.evaluate
+
+        def decide(game_value):
+            stop = None if options["budget"] is None else Deadline(options["budget"])
+            direction, values = expectimax(game_value.board, depth, evaluate, table, network is not None, stop)
+            return direction, {"rollouts": 0, "values": values}
+        return decide
+
+    if name == "genetique":
+        from genetiques.model import MOVES
+        genes = iter(options["genome"])
+
+        def decide(game_value):
+            # La partie s'arrête à la fin de la séquence, comme pendant l'entraînement
+            gene = next(genes, None)
+            return (None if gene is None else MOVES[gene]), None
+        return decide
+
+    raise ValueError(f"agent inconnu : {name}")
+
+
+def play_game(job):
+    """
+    Joue une partie complète sans affichage.
+
+    Args:
+        job (tuple): (numéro de la partie, graine, options de l'agent).
+
+    Returns:
+        tuple: Le numéro de la partie, sa graine, le score, la plus grande tuile, le
+        nombre de coups, la durée en secondes, la latence de chaque décision
+        (numpy.ndarray float32, en secondes) et, si options["record"], les tableaux
+        (enregistrements, statistiques) de la trajectoire, None sinon.
+    """
+    number, seed, options = job
+    rng = random.Random(seed)
+    decide = make_agent(options, seed)
+    game_value = Game_value()
+    game_value.board = new_board(rng)
+    trajectory = GameTrajectory() if options.get("record") else None
+    latencies = []
+    start = time.perf_counter()
+    while True:
+        decision_start = time.perf_counter()
+        direction, stats = decide(game_value)
+        latencies.append(time.perf_counter() - decision_start)
+        if direction is None:
+            break
+        board, score = game_value.board, game_value.score
+        reponse = apply_move(game_value, direction, rng)
+        if trajectory is not None:
+            trajectory.record(board, score, direction, game_value.board, **(stats or {}))
+        if reponse == "lost":
+            break
+    moves = len(latencies) - (direction is None)
+    if trajectory is not None:
+        trajectory.end(game_value.board, game_value.score)
+        trajectory = (trajectory.records(), trajectory.stats())
+    return (number, seed, game_value.score, max_tile(game_value.board), moves, time.perf_counter() - start,
+            np.array(latencies, dtype=np.float32), trajectory)
+
+
+def _init_worker(stats):
+    # Les processus ne journalisent rien : seul le résumé final est enregistré
+    journal.setup(console=False)
+    # Compteurs propres au processus (avec fork, ceux du parent sont copiés)
+    STATS.reset()
+    if stats:
+        STATS.enable()
+
+
+def _play_in_worker(job):
+    """play_game dans un processus du pool, avec les compteurs de la partie (ou None)."""
+    result = play_game(job)
+    if not STATS.enabled:
+        return result, None
+    counters = STATS.export()
+    STATS.reset()
+    return result, counters
+
+
+def run(options, nb_games, workers=1, seed=None, progress_every=0, writer=None):
+    """
+    Joue nb_games parties, réparties entre workers processus.
+
+    Args:
+        writer (TrajectoryWriter): Avec options["record"], reçoit la trajectoire de chaque
+            partie, dans l'ordre des numéros (la partie i est la i-ème du fichier).
+
+    Returns:
+        tuple: Les parties (tuples de play_game sans leur trajectoire, dans l'ordre des
+        numéros) et la durée totale.
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(nb_games, dtype=np.uint64).tolist()
+    jobs = [(number, game_seed, options) for number, game_seed in enumerate(seeds)]
+    games = []
+    start = time.perf_counter()
+
+    def collect(result):
+        if writer is not None and result[7] is not None:
+            writer.write(result[7])
+        # La trajectoire n'est pas gardée en mémoire
+        games.append(result[:7] + (None,))
+        _progress(len(games), nb_games, start, progress_every)
+
+    if workers > 1:
+        with make_pool(workers, _init_worker, (STATS.enabled,)) as pool:
+            chunk_size = max(1, min(16, nb_games // (8 * workers)))
+            for result, counters in pool.imap(_play_in_worker, jobs, chunk_size):
+                if counters is not None:
+                    STATS.merge(counters)
+                collect(result)
+    else:
+        for job in jobs:
+            collect(play_game(job))
+    return games, time.perf_counter() - start
+
+
+def _progress(done, total, start, every):
+    if every and (done % every == 0 or done == total):
+        print(f"{done}/{total} parties ({time.perf_counter() - start:.1f} s)", file=sys.stderr)
+
+
+def summarize(games, elapsed):
+    """
+    Returns:
+        dict: La distribution des scores, les taux de tuiles, les coups par partie,
+        les centiles de latence (ms) et le débit.
+    """
+    if not games:
+        raise ValueError("aucune partie à résumer")
+    scores = np.array([game[2] for game in games], dtype=np.float64)
+    tiles = np.array([game[3] for game in games])
+    moves = np.array([game[4] for game in games], dtype=np.float64)
+    latencies = np.concatenate([game[6] for game in games])
+    return {
+        "games": len(games),
+        "seconds": elapsed,
+        "games_per_s": len(games) / elapsed if elapsed else 0.0,
+        "moves_per_s": moves.sum() / elapsed if elapsed else 0.0,
+        "score": {
+            "mean": float(scores.mean()),
+            "std": float(scores.std()),
+            "min": float(scores.min()),
+            "max": float(scores.max()),
+            **{f"p{q:g}": float(np.percentile(scores, q)) for q in SCORE_PERCENTILES},
+        },
+        "max_tile_rate": {str(tile): float((tiles >= tile).mean()) for tile in TILE_THRESHOLDS},
+        "max_tile_counts": {str(int(tile)): int(count) for tile, count in zip(*np.unique(tiles, return_counts=True))},
+        "moves": {"mean": float(moves.mean()), "p50": float(np.percentile(moves, 50)), "max": float(moves.max())},
+        "decision_ms": {
+            "mean": 1000 * float(latencies.mean()) if len(latencies) else 0.0,
+            **{f"p{q:g}": 1000 * float(np.percentile(latencies, q)) if len(latencies) else 0.0
+               for q in LATENCY_PERCENTILES},
+            "max": 1000 * float(latencies.max()) if len(latencies) else 0.0,
+        },
+    }
+
+
+def format_summary(summary):
+    """Le résumé sous forme de texte."""
+    score = summary["score"]
+    lines = [
+        f"{summary['games']} parties en {summary['seconds']:.1f} s "
+        f"({summary['games_per_s']:.2f} parties/s, {summary['moves_per_s']:.0f} coups/s)",
+        f"score     moyenne {score['mean']:.0f} ± {score['std']:.0f}, min {score['min']:.0f}, max {score['max']:.0f}",
+        "          " + ", ".join(f"p{q:g} {score[f'p{q:g}']:.0f}" for q in SCORE_PERCENTILES),
+        "tuiles    " + ", ".join(f">= {tile} : {100 * rate:.1f} %"
+                                 for tile, rate in summary["max_tile_rate"].items()),
+        f"coups     moyenne {summary['moves']['mean']:.0f}, médiane {summary['moves']['p50']:.0f}, "
+        f"max {summary['moves']['max']:.0f}",
+        "décision  " + ", ".join(f"{key} {value:.2f} ms" for key, value in summary["decision_ms"].items()),
+    ]
+    return "\n".join(lines)
+
+
+def write_csv(games, file_name):
+    """Une ligne par partie (CSV_COLUMNS)."""
+    with open(file_name, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        for number, seed, score, tile, moves, seconds, latencies, _ in games:
+            writer.writerow((number, seed, score, tile, moves, round(seconds, 4),
+                             round(1000 * float(latencies.mean()), 4) if len(latencies) else 0.0,
+                             round(1000 * float(latencies.max()), 4) if len(latencies) else 0.0))
+
+
+def _genome(checkpoint_dir):
+    """Le meilleur individu du point de reprise le plus récent."""
+    from genetiques.sauvegarde import load_pop
+
+    state = load_pop(checkpoint_dir)
+    if state is None:
+        sys.exit(f"aucun point de reprise dans {checkpoint_dir} : lancer d'abord python -m genetiques.geneticgameIA")
+    return state["best"]
+
+
+if __name__ == "__main__":
+    from genetiques.sauvegarde import CHECKPOINT_DIR
+
+    parser = argparse.ArgumentParser(description="Parties sans affichage pour évaluer un agent de 2048-IA")
+    parser.add_argument("--agent", choices=AGENTS, required=True)
+    parser.add_argument("--games", type=positive_int, default=100)
+    parser.add_argument("--workers", type=positive_int, default=1, help="nombre de processus")
+    parser.add_argument("--seed", type=int, default=None, help="graine des parties (aléatoire par défaut)")
+    parser.add_argument("--budget", type=parse_duration, default=None,
+                        help="temps par décision (50ms, 0.5s) : montecarlo, expectimax (arrêt de la recherche)")
+    parser.add_argument("--rollouts", type=int, default=None, help="simulations par décision (montecarlo)")
+    parser.add_argument("--depth", type=int, default=None, help="profondeur de recherche (expectimax)")
+    parser.add_argument("--network", help="poids du réseau de n-uplets (montecarlo, expectimax)")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR, help="points de reprise (genetique)")
+    parser.add_argument("--output", help="fichier JSON du rapport")
+    parser.add_argument("--csv", help="fichier CSV, une ligne par partie")
+    parser.add_argument("--progress", type=int, default=0, metavar="N", help="avancement toutes les N parties")
+    parser.add_argument("--record", metavar="FILE",
+                        help="ajoute les trajectoires des parties à FILE (format binaire de engine.trajectory)")
+    instrumentation.add_arguments(parser)
+    journal.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.setup(args.stats, args.stats_file, args.profile)
+    journal.setup(args.log_level, args.log_file, args.trace_moves)
+
+    if args.agent == "montecarlo" and args.budget is None and args.rollouts is None:
+        from montecarlo.gameIAMontecarlo import TIME_BUDGET
+        args.budget = TIME_BUDGET
+    options = {
+        "agent": args.agent,
+        "budget": args.budget,
+        "rollouts": args.rollouts,
+        "depth": args.depth,
+        "network": args.network,
+        "genome": _genome(args.checkpoint_dir) if args.agent == "genetique" else None,
+        "record": args.record is not None,
+    }
+
+    writer = TrajectoryWriter(args.record, stats=True) if args.record else None
+    try:
+        games, elapsed = run(options, args.games, args.workers, args.seed, args.progress, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+    summary = summarize(games, elapsed)
+    print(format_summary(summary))
+    log_event("play", agent=args.agent, games=summary["games"], mean=summary["score"]["mean"],
+              p50=summary["score"]["p50"], rate_2048=summary["max_tile_rate"]["2048"],
+              decision_p99_ms=summary["decision_ms"]["p99"])
+
+    if args.output:
+        report = {
+            "meta": {
+                "agent": args.agent,
+                "seed": args.seed,
+                "workers": args.workers,
+                "options": {key: value for key, value in options.items() if key != "genome"},
+                "record": args.record,
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "summary": summary,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.csv:
+        write_csv(games, args.csv)
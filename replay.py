@@ -0,0 +1,157 @@
+import argparse
+import math
+import pygame
+from engine.bitboard import DIRECTIONS, Game_value
+from engine.trajectory import NO_MOVE, TrajectoryReader
+from interface import WIDTH, draw, get_window
+
+# Relecture des parties enregistrées (python -m play.play --record FILE) :
+#
+#   python replay.py parties.traj --game 3 --move 900
+#
+# Aller à un coup ne rejoue rien : la partie est une vue sur le fichier projeté
+# en mémoire et chaque position y est lue directement.
+#
+# Commandes : flèches gauche / droite un coup (maintenues : défilement rapide),
+# avec Maj dix coups ; Début / Fin ; Page précédente / suivante partie
+# précédente / suivante ; Espace lecture / pause, flèches haut / bas vitesse
+# de lecture ; un numéro puis Entrée va à ce coup ; clic ou glissé de la souris
+# sur la largeur de la fenêtre pour parcourir la partie ; Échap pour quitter.
+
+FPS = 60
+SPEEDS = (2, 5, 10, 30, 60)  # Coups par seconde en lecture
+KEY_REPEAT = (200, 15)  # Délai et intervalle de répétition des touches maintenues (ms)
+FAST_STEP = 10  # Coups sautés avec Maj
+
+
+def describe(game, nb_games, records, stats, index):
+    """
+    Describes a position for the window caption.
+
+    Args:
+        game (int): Number of the game in the file, from 0 like --game and the
+            game column of the play.play CSV.
+        nb_games (int): Number of games in the file.
+        records (numpy.ndarray): The records of the game.
+        stats (numpy.ndarray): The decision stats of the game, or None.
+        index (int): The position shown.
+
+    Returns:
+        str: The game, the move, the direction played and, when recorded,
+        the rollouts and the value of every direction.
+    """
+    record = records[index]
+    parts = [f"partie {game}/{nb_games - 1}", f"coup {index}/{len(records) - 1}"]
+    parts.append("fin" if record["move"] == NO_MOVE else f"joué : {DIRECTIONS[record['move']]}")
+    if stats is not None:
+        rollouts = int(stats[index]["rollouts"])
+        if rollouts:
+            parts.append(f"{rollouts} simulations")
+        values = [f"{name} {value:.0f}" for name, value in zip(DIRECTIONS, stats[index]["values"])
+                  if not math.isnan(value)]
+        if values:
+            parts.append(" ".join(values))
+    return " - ".join(parts)
+
+
+def replay(window, path, game=0, move=0, fps=FPS):
+    """
+    Shows a recorded game, position by position.
+
+    Args:
+        window (pygame.Surface): The game window.
+        path (str): The trajectory file written by engine.trajectory.TrajectoryWriter.
+        game (int): The game shown first.
+        move (int): The position shown first (clamped to the game length).
+        fps (int): Frame rate of the display.
+    """
+    reader = TrajectoryReader(path)
+    if not len(reader):
+        raise ValueError(f"{path} ne contient aucune partie")
+    game = min(max(game, 0), len(reader) - 1)
+    records, stats = reader.game(game), reader.game_stats(game)
+    index = min(max(move, 0), len(records) - 1)
+
+    clock = pygame.time.Clock()
+    pygame.key.set_repeat(*KEY_REPEAT)
+    shown = Game_value()
+    playing = False
+    speed_index = 2
+    elapsed = 0.0
+    typed = ""
+    caption = None
+
+    try:
+        while True:
+            last = len(records) - 1
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 or (
+                        event.type == pygame.MOUSEMOTION and event.buttons[0]):
+                    # Parcours à la souris : la largeur de la fenêtre couvre toute la partie
+                    index = min(max(round(event.pos[0] / (WIDTH - 1) * last), 0), last)
+                    continue
+                if event.type != pygame.KEYDOWN:
+                    continue
+                step = FAST_STEP if event.mod & pygame.KMOD_SHIFT else 1
+                if event.key == pygame.K_ESCAPE:
+                    return
+                elif event.key == pygame.K_RIGHT:
+                    index = min(index + step, last)
+                elif event.key == pygame.K_LEFT:
+                    index = max(index - step, 0)
+                elif event.key == pygame.K_HOME:
+                    index = 0
+                elif event.key == pygame.K_END:
+                    index = last
+                elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    game = min(max(game + (1 if event.key == pygame.K_PAGEDOWN else -1), 0), len(reader) - 1)
+                    records, stats = reader.game(game), reader.game_stats(game)
+                    index = min(index, len(records) - 1)
+                elif event.key == pygame.K_SPACE:
+                    playing = not playing
+                    elapsed = 0.0
+                elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                    change = 1 if event.key == pygame.K_UP else -1
+                    speed_index = min(max(speed_index + change, 0), len(SPEEDS) - 1)
+                elif event.unicode.isdigit():
+                    typed += event.unicode
+                elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER) and typed:
+                    index = min(int(typed), len(records) - 1)
+                    typed = ""
+                elif event.key == pygame.K_BACKSPACE:
+                    typed = typed[:-1]
+
+            seconds = clock.tick(fps) / 1000
+            if playing:
+                # Lecture : autant de coups que le temps écoulé le permet
+                elapsed += seconds * SPEEDS[speed_index]
+                advance = int(elapsed)
+                elapsed -= advance
+                index = min(index + advance, len(records) - 1)
+                if index == len(records) - 1:
+                    playing = False
+
+            record = records[index]
+            shown.board, shown.score = int(record["board"]), int(record["score"])
+            draw(window, shown)
+            text = describe(game, len(reader), records, stats, index)
+            if typed:
+                text += f" - aller au coup {typed}"
+            if text != caption:
+                pygame.display.set_caption(text)
+                caption = text
+    finally:
+        pygame.key.set_repeat()
+        pygame.display.set_caption("2048")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Relecture des parties enregistrées par python -m play.play --record")
+    parser.add_argument("path", help="fichier de trajectoires")
+    parser.add_argument("--game", type=int, default=0, help="numéro de la partie (à partir de 0)")
+    parser.add_argument("--move", type=int, default=0, help="coup affiché au départ")
+    args = parser.parse_args()
+    replay(get_window(), args.path, args.game, args.move)
+    pygame.quit()
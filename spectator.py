@@ -0,0 +1,245 @@
+import random
+import threading
+import time
+from collections import deque
+import pygame
+from engine.bitboard import Game_value, apply_move, new_board
+from engine.decision import AsyncAgent
+from engine.journal import GameLog
+from interface import draw
+
+# Mode spectateur : l'agent joue à pleine vitesse dans un thread et publie
+# chaque position dans un petit tampon circulaire ; la fenêtre affiche la
+# dernière position à sa propre cadence, les positions intermédiaires sont
+# sautées quand l'agent va plus vite que l'affichage.
+#
+# Commandes : Espace pause / reprise, flèche droite un coup en avant (en pause),
+# flèche gauche un coup en arrière dans le tampon (en pause), flèches haut / bas
+# vitesse de l'agent, R pour une nouvelle partie, Échap ou fermeture de la
+# fenêtre pour quitter. Les deux derniers interrompent la décision en cours.
+
+FPS = 60  # Cadence de l'affichage, indépendante de celle de l'agent
+BUFFER_SIZE = 256  # Positions gardées pour le retour en arrière
+SPEEDS = (None, 100, 30, 10, 3, 1)  # Coups par seconde de l'agent, None : sans limite
+DECISION_POLL = 0.05  # Intervalle de vérification de l'échéance d'une décision, en secondes
+
+
+class SnapshotBuffer:
+    """
+    Ring buffer of the last positions of a game, shared between the agent
+    thread (writer) and the display loop (reader).
+
+    Every snapshot is a (move, board, score, direction) tuple, move being the
+    number of moves played.
+    """
+
+    def __init__(self, size=BUFFER_SIZE):
+        self.snapshots = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def push(self, move, board, score, direction=None):
+        with self.lock:
+            self.snapshots.append((move, board, score, direction))
+
+    def latest(self):
+        """
+        Returns:
+            tuple: The last snapshot, or None if the buffer is empty.
+        """
+        with self.lock:
+            return self.snapshots[-1] if self.snapshots else None
+
+    def get(self, move):
+        """
+        Returns:
+            tuple: The snapshot after the given number of moves, or None if it
+            is not (or no longer) in the buffer.
+        """
+        with self.lock:
+            if not self.snapshots:
+                return None
+            index = move - self.snapshots[0][0]
+            if 0 <= index < len(self.snapshots):
+                return self.snapshots[index]
+            return None
+
+
+class AgentWorker(threading.Thread):
+    """
+    Plays a game in the background and publishes every position.
+
+    The agent is a function (game_value, stop) -> direction (None when it gives
+    up), stop being a threading.Event set when the deadline passes or the game
+    is stopped. Every decision runs through an engine.decision.AsyncAgent;
+    the worker applies the moves, paces them (speed) and can be paused,
+    stepped one move at a time or stopped, even during a decision.
+    """
+
+    def __init__(self, decide, game_value, buffer, agent="spectator", rng=random, deadline=None):
+        super().__init__(daemon=True)
+        self.agent = AsyncAgent(decide, deadline)
+        self.game_value = game_value
+        self.buffer = buffer
+        self.rng = rng
+        self.log = GameLog(agent, mode="spectator")
+        self.speed = None
+        self.finished = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._steps = 0
+        self._stopping = threading.Event()
+        self._wake = threading.Condition()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        with self._wake:
+            self._running.set()
+            self._wake.notify()
+
+    def paused(self):
+        return not self._running.is_set()
+
+    def step(self):
+        """Plays one more move while paused."""
+        with self._wake:
+            self._steps += 1
+            self._wake.notify()
+
+    def stop(self):
+        """Stops the game, interrupting the decision in progress."""
+        with self._wake:
+            self._stopping.set()
+            self._wake.notify()
+        self.agent.cancel()
+
+    def _wait_turn(self):
+        """Waits until the game runs or a step is requested; False once stopped."""
+        with self._wake:
+            while not self._stopping.is_set():
+                if self._running.is_set():
+                    return True
+                if self._steps:
+                    self._steps -= 1
+                    return True
+                self._wake.wait()
+        return False
+
+    def run(self):
+        game_value = self.game_value
+        moves = 0
+        self.buffer.push(moves, game_value.board, game_value.score)
+        try:
+            while self._wait_turn():
+                start = time.perf_counter()
+                decision = self.agent.submit(game_value)
+                # Attente par tranches : l'échéance et l'arrêt sont vérifiés à chaque réveil
+                while not decision.wait(DECISION_POLL):
+                    if self._stopping.is_set():
+                        decision.cancel()
+                if self._stopping.is_set():
+                    break
+                direction = decision.result()
+                decision_seconds = time.perf_counter() - start
+                if direction is None:
+                    break
+                reponse = apply_move(game_value, direction, self.rng)
+                moves += 1
+                self.log.move(game_value, direction, decision_seconds)
+                self.buffer.push(moves, game_value.board, game_value.score, direction)
+                if reponse == "lost":
+                    break
+                if self.speed:
+                    # Cadence limitée : attente interrompue par stop
+                    self._stopping.wait(max(0.0, 1 / self.speed - (time.perf_counter() - start)))
+        finally:
+            self.agent.close()
+            self.log.end(game_value)
+            self.finished.set()
+
+
+def _caption(worker, move, shown_move):
+    speed = "max" if worker.speed is None else f"{worker.speed} coups/s"
+    state = "fin" if worker.finished.is_set() else "pause" if worker.paused() else "en cours"
+    behind = f" (coup {shown_move})" if shown_move != move else ""
+    return f"2048 - spectateur - coup {move}{behind} - {speed} - {state}"
+
+
+def spectate(window, game_value, decide, agent="spectator", rng=random, fps=FPS, deadline=None):
+    """
+    Watches an agent play a full game at its own speed.
+
+    Args:
+        window (pygame.Surface): The game window.
+        game_value (Game_value): The game, already started (board and score set).
+        decide (callable): The agent: (game_value, stop) -> direction, None to give up.
+        agent (str): Name of the agent in the game log.
+        rng (random.Random): The random generator used for the spawns.
+        fps (int): Frame rate of the display.
+        deadline (float): Maximum duration of a decision, in seconds, None for no limit.
+
+    Returns:
+        str: "lost" if the game was over when the window was closed, "quit" otherwise.
+    """
+    buffer = SnapshotBuffer()
+    worker = AgentWorker(decide, game_value, buffer, agent, rng, deadline)
+    worker.start()
+    clock = pygame.time.Clock()
+    shown = None  # Coup affiché en pause, None : suivre le dernier
+    speed_index = 0
+    caption = None
+    shown_game = Game_value()
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                worker.stop()
+                pygame.display.set_caption("2048")
+                return "lost" if worker.finished.is_set() else "quit"
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_r:
+                # Nouvelle partie : l'ancien agent s'arrête avant que la partie soit réinitialisée
+                worker.stop()
+                worker.join()
+                game_value.score = 0
+                game_value.board = new_board(rng)
+                buffer = SnapshotBuffer()
+                worker = AgentWorker(decide, game_value, buffer, agent, rng, deadline)
+                worker.speed = SPEEDS[speed_index]
+                worker.start()
+                shown = None
+            elif event.key == pygame.K_SPACE:
+                if worker.paused():
+                    shown = None
+                    worker.resume()
+                else:
+                    worker.pause()
+            elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                step = -1 if event.key == pygame.K_UP else 1
+                speed_index = min(max(speed_index + step, 0), len(SPEEDS) - 1)
+                worker.speed = SPEEDS[speed_index]
+            elif worker.paused() or worker.finished.is_set():
+                latest = buffer.latest()
+                current = latest[0] if shown is None else shown
+                if event.key == pygame.K_LEFT and buffer.get(current - 1) is not None:
+                    shown = current - 1
+                elif event.key == pygame.K_RIGHT:
+                    if current < latest[0]:
+                        shown = current + 1
+                    else:
+                        shown = None
+                        worker.step()
+
+        latest = buffer.latest()
+        snapshot = latest if shown is None else buffer.get(shown) or latest
+        if snapshot is not None:
+            move, shown_game.board, shown_game.score, _ = snapshot
+            draw(window, shown_game)
+            text = _caption(worker, latest[0], move)
+            if text != caption:
+                pygame.display.set_caption(text)
+                caption = text
+        clock.tick(fps)
+